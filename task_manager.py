@@ -1,21 +1,68 @@
 
 from __future__ import annotations
 
+import argparse
+import bisect
+import heapq
+import hashlib
 import json
+import math
+import mmap
 import os
+import re
+import sqlite3
+import struct
+import sys
 import threading
+import time
 import urllib.request
 import urllib.parse
-from dataclasses import dataclass, asdict, field
+import zlib
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, date
 from enum import Enum
-from typing import List, Dict, Optional, Iterable
+from itertools import islice
+from typing import Any, List, Dict, Optional, Iterable, Iterator, Set, Tuple, Union, IO
 from calendar import monthcalendar, month_name
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 
-
+try:
+    import numpy as np  # type: ignore
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+try:
+    from pypinyin import lazy_pinyin  # type: ignore
+    _HAS_PYPINYIN = True
+except ImportError:
+    _HAS_PYPINYIN = False
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+FLUSH_INTERVAL_SECONDS = 2.0
+INITIAL_LOAD_TASKS = 200
+LOAD_CHUNK_TASKS = 5000
+INDEX_CHUNK_TASKS = 100
+SNAPSHOT_MAGIC = b"LHTS"
+SNAPSHOT_VERSION = 1
+EXTERNAL_POLL_MS = 2000
+QUERY_CACHE_SIZE = 32
+SEARCH_STACK_DEPTH = 16
+SORT_INDEX_RATIO = 4
+FILTER_DEBOUNCE_MS = 150
+FUZZY_THRESHOLD = 0.4
+FUZZY_CANDIDATE_LIMIT = 2000
 
 
 class I18n:
@@ -31,6 +78,8 @@ class I18n:
             "refresh": "🔄 刷新",
             "task_list": "🐕 📝 任务列表",
             "search": "🔍",
+            "exact": "= 精确",
+            "fuzzy": "≈ 模糊",
             "filter": "筛选:",
             "all": "全部",
             "level": "级别",
@@ -135,6 +184,8 @@ class I18n:
             "refresh": "🔄 Refresh",
             "task_list": "🐕 📝 Task List",
             "search": "🔍",
+            "exact": "= Exact",
+            "fuzzy": "≈ Fuzzy",
             "filter": "Filter:",
             "all": "All",
             "level": "Level",
@@ -281,20 +332,123 @@ class TaskType(Enum):
     WEEKLY = "每周任务"
 
 
-@dataclass
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_US_PER_DAY = 86400 * 1000000
+
+
+def _epoch_us(dt: datetime) -> int:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return (dt - _EPOCH) // _ONE_MICROSECOND
+
+
+def _to_epoch_us(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    return _epoch_us(datetime.fromisoformat(value))
+
+
+def _from_epoch_us(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _now_epoch_us() -> int:
+    return _epoch_us(datetime.now())
+
+
+def _today_day_number() -> int:
+    return (date.today() - _EPOCH.date()).days
+
+
 class Task:
 
-    id: str
-    name: str
-    description: str = ""
-    level: TaskLevel = TaskLevel.NORMAL
-    task_type: TaskType = TaskType.ONCE
-    tags: List[str] = field(default_factory=list)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    completed: bool = False
-    completed_at: Optional[str] = None
-    last_completed: Optional[str] = None
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "level",
+        "task_type",
+        "_tags",
+        "created_ts",
+        "completed",
+        "completed_ts",
+        "last_completed_ts",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        description: str = "",
+        level: TaskLevel = TaskLevel.NORMAL,
+        task_type: TaskType = TaskType.ONCE,
+        tags: Optional[Iterable[str]] = None,
+        created_at: Optional[str] = None,
+        completed: bool = False,
+        completed_at: Optional[str] = None,
+        last_completed: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.description = description
+        self.level = level
+        self.task_type = task_type
+        self.tags = tags or []
+        self.created_ts: int = _epoch_us(datetime.fromisoformat(created_at)) if created_at else _now_epoch_us()
+        self.completed = completed
+        self.completed_ts: Optional[int] = _to_epoch_us(completed_at)
+        self.last_completed_ts: Optional[int] = _to_epoch_us(last_completed)
+
+    def __repr__(self) -> str:
+        return f"Task(id={self.id!r}, name={self.name!r}, level={self.level.name}, task_type={self.task_type.name})"
+
+
+    @property
+    def tags(self) -> List[str]:
+        return self._tags
+
+    @tags.setter
+    def tags(self, value: Iterable[str]) -> None:
+        self._tags = [sys.intern(t) for t in value]
+
+    @property
+    def created_at(self) -> str:
+        return _from_epoch_us(self.created_ts).isoformat()
+
+    @created_at.setter
+    def created_at(self, value: str) -> None:
+        self.created_ts = _epoch_us(datetime.fromisoformat(value))
+
+    @property
+    def completed_at(self) -> Optional[str]:
+        dt = self.completed_dt
+        return dt.isoformat() if dt else None
 
+    @completed_at.setter
+    def completed_at(self, value: Optional[str]) -> None:
+        self.completed_ts = _to_epoch_us(value)
+
+    @property
+    def last_completed(self) -> Optional[str]:
+        dt = self.last_completed_dt
+        return dt.isoformat() if dt else None
+
+    @last_completed.setter
+    def last_completed(self, value: Optional[str]) -> None:
+        self.last_completed_ts = _to_epoch_us(value)
+
+    @property
+    def created_dt(self) -> datetime:
+        return _from_epoch_us(self.created_ts)
+
+    @property
+    def completed_dt(self) -> Optional[datetime]:
+        return None if self.completed_ts is None else _from_epoch_us(self.completed_ts)
+
+    @property
+    def last_completed_dt(self) -> Optional[datetime]:
+        return None if self.last_completed_ts is None else _from_epoch_us(self.last_completed_ts)
 
     @property
     def is_once(self) -> bool:
@@ -302,20 +456,18 @@ class Task:
 
     @property
     def can_complete(self) -> bool:
-        now = datetime.now()
-
         if self.task_type == TaskType.ONCE:
             return not self.completed
 
-        if not self.last_completed:
+        if self.last_completed_ts is None:
             return True
 
-        last_dt = datetime.fromisoformat(self.last_completed)
+        last_day = self.last_completed_ts // _US_PER_DAY
         if self.task_type == TaskType.DAILY:
-            return now.date() > last_dt.date()
+            return _today_day_number() > last_day
 
         if self.task_type == TaskType.WEEKLY:
-            return now.date() >= (last_dt.date() + timedelta(days=7))
+            return _today_day_number() >= last_day + 7
 
         return False
 
@@ -326,7 +478,7 @@ class Task:
 
         if self.can_complete:
             return "可完成"
-        if self.last_completed:
+        if self.last_completed_ts is not None:
             return "冷却中"
         return "进行中"
 
@@ -335,22 +487,30 @@ class Task:
         if not self.can_complete:
             return False
 
-        now_str = datetime.now().isoformat()
+        now_ts = _now_epoch_us()
 
         if self.is_once:
             self.completed = True
-            self.completed_at = now_str
+            self.completed_ts = now_ts
         else:
-            self.last_completed = now_str
+            self.last_completed_ts = now_ts
 
         return True
 
 
     def to_dict(self) -> Dict:
-        data = asdict(self)
-        data["level"] = self.level.name
-        data["task_type"] = self.task_type.name
-        return data
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "level": self.level.name,
+            "task_type": self.task_type.name,
+            "tags": list(self._tags),
+            "created_at": self.created_at,
+            "completed": self.completed,
+            "completed_at": self.completed_at,
+            "last_completed": self.last_completed,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict) -> "Task":
@@ -361,12 +521,899 @@ class Task:
             level=TaskLevel[data["level"]],
             task_type=TaskType[data["task_type"]],
             tags=data.get("tags", []),
-            created_at=data.get("created_at", datetime.now().isoformat()),
+            created_at=data.get("created_at"),
             completed=data.get("completed", False),
             completed_at=data.get("completed_at"),
             last_completed=data.get("last_completed"),
         )
 
+    @classmethod
+    def from_timestamps(
+        cls,
+        id: str,
+        name: str,
+        description: str,
+        level: TaskLevel,
+        task_type: TaskType,
+        tags: Iterable[str],
+        created_ts: int,
+        completed: bool,
+        completed_ts: Optional[int],
+        last_completed_ts: Optional[int],
+    ) -> "Task":
+        task = cls.__new__(cls)
+        task.id = id
+        task.name = name
+        task.description = description
+        task.level = level
+        task.task_type = task_type
+        task.tags = tags
+        task.created_ts = created_ts
+        task.completed = completed
+        task.completed_ts = completed_ts
+        task.last_completed_ts = last_completed_ts
+        return task
+
+
+@dataclass(frozen=True)
+class TaskFilter:
+
+    keyword: str = ""
+    level: Optional[TaskLevel] = None
+    task_type: Optional[TaskType] = None
+    tags: Tuple[str, ...] = ()
+    status: Optional[str] = None
+    sort_field: str = "default"
+    descending: bool = False
+    query: str = ""
+    fuzzy: bool = False
+
+
+@dataclass(frozen=True)
+class QueryTerm:
+
+    field: str
+    value: Any
+    negated: bool = False
+    source: str = ""
+
+
+@dataclass(frozen=True)
+class Query:
+
+    terms: Tuple[QueryTerm, ...] = ()
+    sort_field: Optional[str] = None
+    descending: Optional[bool] = None
+
+
+@dataclass(frozen=True)
+class BoardStats:
+
+    total: int = 0
+    completed: int = 0
+    progress: int = 0
+    available: int = 0
+    cooldown: int = 0
+    by_level: Dict[str, int] = field(default_factory=dict)
+    by_type: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def percent(self) -> float:
+        return self.progress * 100.0 / self.total if self.total else 0.0
+
+
+@dataclass
+class BatchResult:
+
+    task_id: str
+    ok: bool
+    coins: int = 0
+    error: str = ""
+
+
+_NO_TIMESTAMP = -(1 << 63)
+_NEVER_AVAILABLE = (1 << 63) - 1
+_TYPE_CODES = {TaskType.ONCE.name: 0, TaskType.DAILY.name: 1, TaskType.WEEKLY.name: 2}
+
+
+def _tag_key(tag: str) -> str:
+    return tag.strip().casefold()
+
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+def _collation_key(name: str, pinyin: bool = False) -> Tuple[Tuple[Tuple[int, Any], ...], str]:
+    text = name.casefold()
+    if pinyin and _HAS_PYPINYIN:
+        text = "".join(lazy_pinyin(text))
+    parts: List[Tuple[int, Any]] = []
+    for i, chunk in enumerate(_DIGITS.split(text)):
+        if i % 2:
+            parts.append((0, int(chunk)))
+        elif chunk:
+            parts.append((1, chunk))
+    return tuple(parts), name
+
+
+def _parse_tag_clauses(clauses: Iterable[str]) -> Tuple[List[List[str]], List[str]]:
+    required: List[List[str]] = []
+    excluded: List[str] = []
+    for clause in clauses:
+        clause = clause.strip()
+        if clause.startswith("-"):
+            key = _tag_key(clause[1:])
+            if key:
+                excluded.append(key)
+            continue
+        options = [key for key in map(_tag_key, clause.split("|")) if key]
+        if options:
+            required.append(options)
+    return required, excluded
+
+
+_QUERY_TOKEN = re.compile(r'(-)?(?:([A-Za-z_]+):)?(?:"([^"]*)"?|(\S+))')
+_QUERY_FIELDS = {
+    "level": "level",
+    "lv": "level",
+    "type": "type",
+    "tag": "tag",
+    "tags": "tag",
+    "status": "status",
+    "created": "created",
+    "sort": "sort",
+    "order": "order",
+}
+_SORT_CHOICES = {"default": "default", "level": "level", "name": "name", "created": "created_at"}
+_STATUS_CHOICES = {"available": "available", "cooldown": "cooldown", "completed": "completed"}
+
+
+def _match_choice(value: str, choices: Dict[str, Any], what: str) -> Any:
+    key = value.casefold()
+    if key in choices:
+        return choices[key]
+    found = {choice for name, choice in choices.items() if key and name.startswith(key)}
+    if len(found) != 1:
+        raise ValueError(f"invalid {what}: {value}")
+    return found.pop()
+
+
+def _parse_created(value: str) -> Tuple[Optional[int], Optional[int]]:
+    op = ""
+    for prefix in (">=", "<=", ">", "<", "="):
+        if value.startswith(prefix):
+            op = prefix
+            value = value[len(prefix):]
+            break
+    try:
+        start = _to_epoch_us(value)
+    except ValueError:
+        start = None
+    if start is None:
+        raise ValueError(f"invalid date: {value}")
+    end = start + (_US_PER_DAY if len(value) == 10 else 1)
+    return {">": (end, None), ">=": (start, None), "<": (None, start), "<=": (None, end)}.get(
+        op, (start, end)
+    )
+
+
+def parse_query(text: str) -> Query:
+    levels: Dict[str, Any] = {}
+    for level in TaskLevel:
+        levels.update({level.name.lower(): level.order, level.label: level.order, str(level.order): level.order})
+    types: Dict[str, Any] = {}
+    for task_type in TaskType:
+        types.update({task_type.name.lower(): _TYPE_CODES[task_type.name], task_type.value: _TYPE_CODES[task_type.name]})
+
+    terms = []
+    sort_field = None
+    descending = None
+    for match in _QUERY_TOKEN.finditer(text):
+        negated, name, quoted, bare = match.groups()
+        value = quoted if quoted is not None else bare
+        if not name and value.endswith(":") and value[:-1].casefold() in _QUERY_FIELDS:
+            continue
+        field = _QUERY_FIELDS.get(name.casefold()) if name else None
+        if name and field is None:
+            value = f"{name}:{value}"
+        if field is None:
+            if value:
+                terms.append(QueryTerm("text", value.lower(), bool(negated), match.group(0)))
+            continue
+        if field == "sort":
+            sort_field = _match_choice(value, _SORT_CHOICES, "sort field")
+            continue
+        if field == "order":
+            descending = _match_choice(value, {"asc": False, "desc": True}, "order")
+            continue
+        if field == "level":
+            term_value = _match_choice(value, levels, "level")
+        elif field == "type":
+            term_value = _match_choice(value, types, "type")
+        elif field == "status":
+            term_value = _match_choice(value, _STATUS_CHOICES, "status")
+        elif field == "tag":
+            term_value = tuple(key for key in map(_tag_key, value.split("|")) if key)
+            if not term_value:
+                raise ValueError(f"invalid tag: {value}")
+        else:
+            term_value = _parse_created(value)
+        terms.append(QueryTerm(field, term_value, bool(negated), match.group(0)))
+    return Query(tuple(terms), sort_field, descending)
+
+
+def _compile_filter(flt: TaskFilter) -> Query:
+    terms = []
+    keyword = flt.keyword.strip()
+    if keyword:
+        terms.append(QueryTerm("text", keyword.lower(), False, keyword))
+    if flt.level is not None:
+        terms.append(QueryTerm("level", flt.level.order, False, f"level:{flt.level.name.lower()}"))
+    if flt.task_type is not None:
+        type_name = flt.task_type.name
+        terms.append(QueryTerm("type", _TYPE_CODES[type_name], False, f"type:{type_name.lower()}"))
+    if flt.status is not None:
+        terms.append(QueryTerm("status", flt.status, False, f"status:{flt.status}"))
+    required, excluded = _parse_tag_clauses(flt.tags)
+    for options in required:
+        terms.append(QueryTerm("tag", tuple(options), False, "tag:" + "|".join(options)))
+    for key in excluded:
+        terms.append(QueryTerm("tag", (key,), True, f"-tag:{key}"))
+    sort_field = flt.sort_field
+    descending = flt.descending
+    if flt.query:
+        query = parse_query(flt.query)
+        terms.extend(query.terms)
+        if query.sort_field is not None:
+            sort_field = query.sort_field
+        if query.descending is not None:
+            descending = query.descending
+    if flt.fuzzy:
+        words = [term for term in terms if term.field == "text" and not term.negated]
+        text = " ".join(term.value for term in words)
+        if FuzzyIndex.trigrams(text):
+            position = terms.index(words[0])
+            terms = [term for term in terms if term not in words]
+            terms.insert(position, QueryTerm("fuzzy", text, False, "~" + " ".join(term.source for term in words)))
+    return Query(tuple(terms), sort_field, descending)
+
+
+class TaskColumns:
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.alive = array("b")
+        self.level = array("b")
+        self.task_type = array("b")
+        self.created = array("q")
+        self.completed = array("b")
+        self.last_completed = array("q")
+        self.available_day = array("q")
+        self.dead = 0
+        self.level_counts: Dict[int, int] = {}
+        self.type_counts = [0, 0, 0]
+        self.completed_count = 0
+        self.progress_count = 0
+        self.available_counts: Dict[int, int] = {0: 0}
+        self.settled_day = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @staticmethod
+    def _extract(entry: Any) -> Tuple[int, int, int, bool, int]:
+        if isinstance(entry, dict):
+            level = TaskLevel[entry["level"]].order
+            type_code = _TYPE_CODES[entry["task_type"]]
+            created = _to_epoch_us(entry.get("created_at"))
+            completed = bool(entry.get("completed", False))
+            last = _to_epoch_us(entry.get("last_completed"))
+        else:
+            level = entry.level.order
+            type_code = _TYPE_CODES[entry.task_type.name]
+            created = entry.created_ts
+            completed = entry.completed
+            last = entry.last_completed_ts
+        return (
+            level,
+            type_code,
+            _NO_TIMESTAMP if created is None else created,
+            completed,
+            _NO_TIMESTAMP if last is None else last,
+        )
+
+    def put(self, task_id: str, entry: Any) -> None:
+        level, type_code, created, completed, last = self._extract(entry)
+        if type_code == 0:
+            available_day = _NEVER_AVAILABLE if completed else 0
+        elif last == _NO_TIMESTAMP:
+            available_day = 0
+        else:
+            available_day = last // _US_PER_DAY + (1 if type_code == 1 else 7)
+
+        row = self.rows.get(task_id)
+        self._tally(level, type_code, completed, last, available_day, 1)
+        if row is None:
+            self.rows[task_id] = len(self.ids)
+            self.ids.append(task_id)
+            self.alive.append(1)
+            self.level.append(level)
+            self.task_type.append(type_code)
+            self.created.append(created)
+            self.completed.append(int(completed))
+            self.last_completed.append(last)
+            self.available_day.append(available_day)
+            return
+
+        self._tally_row(row, -1)
+        self.level[row] = level
+        self.task_type[row] = type_code
+        self.created[row] = created
+        self.completed[row] = int(completed)
+        self.last_completed[row] = last
+        self.available_day[row] = available_day
+
+    def _tally(
+        self, level: int, type_code: int, completed: bool, last: int, available_day: int, sign: int
+    ) -> None:
+        self.level_counts[level] = self.level_counts.get(level, 0) + sign
+        self.type_counts[type_code] += sign
+        if type_code == 0:
+            if completed:
+                self.completed_count += sign
+                self.progress_count += sign
+        elif last != _NO_TIMESTAMP:
+            self.progress_count += sign
+        day = 0 if available_day <= self.settled_day else available_day
+        count = self.available_counts.get(day, 0) + sign
+        if count or not day:
+            self.available_counts[day] = count
+        else:
+            del self.available_counts[day]
+
+    def _tally_row(self, row: int, sign: int) -> None:
+        self._tally(
+            self.level[row],
+            self.task_type[row],
+            bool(self.completed[row]),
+            self.last_completed[row],
+            self.available_day[row],
+            sign,
+        )
+
+    def status_counts(self, today: Optional[int] = None) -> Tuple[int, int]:
+        if today is None:
+            today = _today_day_number()
+        counts = self.available_counts
+        if today < self.settled_day:
+            self.settled_day = today
+            counts.clear()
+            counts[0] = 0
+            for row, alive in enumerate(self.alive):
+                if alive:
+                    day = self.available_day[row]
+                    day = 0 if day <= today else day
+                    counts[day] = counts.get(day, 0) + 1
+        elif today > self.settled_day:
+            self.settled_day = today
+            for day in [day for day in counts if 0 < day <= today]:
+                counts[0] += counts.pop(day)
+        cooldown = sum(count for day, count in counts.items() if day and day != _NEVER_AVAILABLE)
+        return counts[0], cooldown
+
+    def due_day(self, task_id: str) -> Optional[int]:
+        row = self.rows.get(task_id)
+        if row is None or not self.task_type[row] or self.last_completed[row] == _NO_TIMESTAMP:
+            return None
+        return self.available_day[row]
+
+    def remove(self, task_id: str) -> None:
+        row = self.rows.pop(task_id, None)
+        if row is None:
+            return
+        self._tally_row(row, -1)
+        self.alive[row] = 0
+        self.ids[row] = ""
+        self.dead += 1
+        if self.dead > 1024 and self.dead * 2 > len(self.ids):
+            self._vacuum()
+
+    def _vacuum(self) -> None:
+        keep = [row for row, alive in enumerate(self.alive) if alive]
+
+        def pick(column: array) -> array:
+            return array(column.typecode, [column[row] for row in keep])
+
+        self.ids = [self.ids[row] for row in keep]
+        self.rows = {task_id: row for row, task_id in enumerate(self.ids)}
+        self.alive = array("b", [1]) * len(keep)
+        self.level = pick(self.level)
+        self.task_type = pick(self.task_type)
+        self.created = pick(self.created)
+        self.completed = pick(self.completed)
+        self.last_completed = pick(self.last_completed)
+        self.available_day = pick(self.available_day)
+        self.dead = 0
+
+    def match(
+        self,
+        level: Optional[int] = None,
+        type_code: Optional[int] = None,
+        status: Optional[str] = None,
+        today: Optional[int] = None,
+        candidates: Optional[List[int]] = None,
+        created: Optional[Tuple[Optional[int], Optional[int]]] = None,
+    ) -> List[int]:
+        if today is None:
+            today = _today_day_number()
+
+        if _HAS_NUMPY:
+            return self._match_numpy(level, type_code, status, today, candidates, created)
+
+        alive = self.alive
+        rows = [row for row in range(len(self.ids)) if alive[row]] if candidates is None else candidates
+        if level is not None:
+            column = self.level
+            rows = [row for row in rows if column[row] == level]
+        if type_code is not None:
+            column = self.task_type
+            rows = [row for row in rows if column[row] == type_code]
+        if created is not None:
+            column = self.created
+            low, high = created
+            if low is not None:
+                rows = [row for row in rows if column[row] >= low]
+            if high is not None:
+                rows = [row for row in rows if column[row] < high]
+        if status is not None:
+            available = self.available_day
+            task_type = self.task_type
+            if status == "available":
+                rows = [row for row in rows if available[row] <= today]
+            elif status == "cooldown":
+                last = self.last_completed
+                rows = [
+                    row
+                    for row in rows
+                    if task_type[row] and last[row] != _NO_TIMESTAMP and available[row] > today
+                ]
+            elif status == "completed":
+                completed = self.completed
+                rows = [row for row in rows if not task_type[row] and completed[row]]
+        return rows
+
+    def _match_numpy(
+        self,
+        level: Optional[int],
+        type_code: Optional[int],
+        status: Optional[str],
+        today: int,
+        candidates: Optional[List[int]] = None,
+        created: Optional[Tuple[Optional[int], Optional[int]]] = None,
+    ) -> List[int]:
+        index = None if candidates is None else np.asarray(candidates, dtype=np.int64)
+
+        def view(column: array, dtype: Any) -> Any:
+            values = np.frombuffer(column, dtype=dtype)
+            return values if index is None else values[index]
+
+        mask = view(self.alive, np.int8) != 0
+        task_type = view(self.task_type, np.int8)
+        if level is not None:
+            mask &= view(self.level, np.int8) == level
+        if type_code is not None:
+            mask &= task_type == type_code
+        if created is not None:
+            column = view(self.created, np.int64)
+            if created[0] is not None:
+                mask &= column >= created[0]
+            if created[1] is not None:
+                mask &= column < created[1]
+        if status is not None:
+            available = view(self.available_day, np.int64) <= today
+            if status == "available":
+                mask &= available
+            elif status == "cooldown":
+                last = view(self.last_completed, np.int64)
+                mask &= (task_type != 0) & (last != _NO_TIMESTAMP) & ~available
+            elif status == "completed":
+                mask &= (task_type == 0) & (view(self.completed, np.int8) != 0)
+        if index is None:
+            return np.flatnonzero(mask).tolist()
+        return index[mask].tolist()
+
+
+class TextIndex:
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.built = False
+        self.pending: Optional[List[str]] = None
+        self._texts: Dict[str, Tuple[str, str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._narrowing: List[Tuple[str, Set[str]]] = []
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        grams = set(text)
+        grams.update(text[i:i + 2] for i in range(len(text) - 1))
+        return grams
+
+    def put(self, task_id: str, name: str, description: str) -> None:
+        texts = (name.lower(), description.lower())
+        old = self._texts.get(task_id)
+        if old == texts:
+            return
+        self._narrowing.clear()
+        grams = self._grams(texts[0]) | self._grams(texts[1])
+        if old is not None:
+            stale = self._grams(old[0]) | self._grams(old[1])
+            for gram in stale - grams:
+                self._discard(gram, task_id)
+            grams -= stale
+        self._texts[task_id] = texts
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {task_id}
+            else:
+                posting.add(task_id)
+
+    def _discard(self, gram: str, task_id: str) -> None:
+        posting = self._postings.get(gram)
+        if posting is not None:
+            posting.discard(task_id)
+            if not posting:
+                del self._postings[gram]
+
+    def remove(self, task_id: str) -> None:
+        old = self._texts.pop(task_id, None)
+        if old is not None:
+            self._narrowing.clear()
+            for gram in self._grams(old[0]) | self._grams(old[1]):
+                self._discard(gram, task_id)
+
+    def search(self, keyword: str) -> Set[str]:
+        keyword = keyword.lower()
+        stack = self._narrowing
+        while stack and stack[-1][0] not in keyword:
+            stack.pop()
+        if stack and stack[-1][0] == keyword:
+            return stack[-1][1]
+        if len(keyword) < 3:
+            hits = set(self._postings.get(keyword, ()))
+        elif stack:
+            texts = self._texts
+            hits = {
+                task_id
+                for task_id in stack[-1][1]
+                if keyword in texts[task_id][0] or keyword in texts[task_id][1]
+            }
+        else:
+            hits = self._lookup(keyword)
+        stack.append((keyword, hits))
+        if len(stack) > SEARCH_STACK_DEPTH:
+            del stack[0]
+        return hits
+
+    def estimate(self, keyword: str) -> int:
+        keyword = keyword.lower()
+        if len(keyword) < 3:
+            return len(self._postings.get(keyword, ()))
+        postings = self._postings
+        return min(len(postings.get(keyword[i:i + 2], ())) for i in range(len(keyword) - 1))
+
+    def _lookup(self, keyword: str) -> Set[str]:
+        postings = []
+        for i in range(len(keyword) - 1):
+            posting = self._postings.get(keyword[i:i + 2])
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        hits = postings[0].intersection(*postings[1:])
+        texts = self._texts
+        return {
+            task_id
+            for task_id in hits
+            if keyword in texts[task_id][0] or keyword in texts[task_id][1]
+        }
+
+
+class FuzzyIndex:
+
+    _WORD = re.compile(r"\w+")
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.built = False
+        self.pending: Optional[List[str]] = None
+        self._grams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def trigrams(cls, text: str) -> Set[str]:
+        grams: Set[str] = set()
+        for word in cls._WORD.findall(text.casefold()):
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        return grams
+
+    def put(self, task_id: str, name: str, description: str, tags: Iterable[str]) -> None:
+        grams = self.trigrams(" ".join((name, description, *tags)))
+        old = self._grams.get(task_id, set())
+        if old == grams:
+            return
+        for gram in old - grams:
+            self._discard(gram, task_id)
+        postings = self._postings
+        for gram in grams - old:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {task_id}
+            else:
+                posting.add(task_id)
+        self._grams[task_id] = grams
+
+    def _discard(self, gram: str, task_id: str) -> None:
+        posting = self._postings.get(gram)
+        if posting is not None:
+            posting.discard(task_id)
+            if not posting:
+                del self._postings[gram]
+
+    def remove(self, task_id: str) -> None:
+        for gram in self._grams.pop(task_id, ()):
+            self._discard(gram, task_id)
+
+    def search(self, text: str, threshold: float, limit: int) -> Dict[str, Tuple[int, int]]:
+        grams = self.trigrams(text)
+        if not grams:
+            return {}
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        need = max(1, math.ceil(len(grams) * threshold))
+        admit = len(postings) - need + 1
+        counts: Counter[str] = Counter()
+        for posting in postings[:admit]:
+            counts.update(posting)
+        left = len(postings) - admit
+        for posting in postings[admit:]:
+            counts.update(counts.keys() & posting)
+            left -= 1
+            if need - left > 1:
+                counts = Counter({task_id: count for task_id, count in counts.items() if count + left >= need})
+        sizes = self._grams
+        ranks = {
+            task_id: (-count, len(sizes[task_id]))
+            for task_id, count in counts.items()
+            if count >= need
+        }
+        if len(ranks) > limit:
+            best = heapq.nsmallest(limit, ranks.items(), key=lambda item: item[1])
+            ranks = dict.fromkeys(ranks, (0, 0))
+            ranks.update(best)
+        return ranks
+
+
+class TagIndex:
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._ids: Dict[str, Set[str]] = {}
+        self._labels: Dict[str, str] = {}
+        self._task_keys: Dict[str, Tuple[str, ...]] = {}
+
+    def put(self, task_id: str, tags: Iterable[str]) -> None:
+        labels: Dict[str, str] = {}
+        for tag in tags:
+            key = _tag_key(tag)
+            if key and key not in labels:
+                labels[key] = tag.strip()
+        keys = tuple(labels)
+        old = self._task_keys.get(task_id, ())
+        if old == keys:
+            return
+        for key in old:
+            if key not in labels:
+                self._discard(key, task_id)
+        for key, label in labels.items():
+            ids = self._ids.get(key)
+            if ids is None:
+                self._ids[key] = {task_id}
+                self._labels[key] = label
+            else:
+                ids.add(task_id)
+        if keys:
+            self._task_keys[task_id] = keys
+        else:
+            self._task_keys.pop(task_id, None)
+
+    def _discard(self, key: str, task_id: str) -> None:
+        ids = self._ids.get(key)
+        if ids is not None:
+            ids.discard(task_id)
+            if not ids:
+                del self._ids[key]
+                del self._labels[key]
+
+    def remove(self, task_id: str) -> None:
+        for key in self._task_keys.pop(task_id, ()):
+            self._discard(key, task_id)
+
+    def count(self, tag: str) -> int:
+        return len(self._ids.get(_tag_key(tag), ()))
+
+    def suggest(self, prefix: str = "", limit: int = 10) -> List[Tuple[str, int]]:
+        prefix = _tag_key(prefix)
+        matches = [(-len(ids), key) for key, ids in self._ids.items() if key.startswith(prefix)]
+        return [(self._labels[key], -count) for count, key in heapq.nsmallest(limit, matches)]
+
+    def ids(self, keys: Iterable[str]) -> Set[str]:
+        found = [self._ids.get(key, ()) for key in keys]
+        return set().union(*found) if len(found) != 1 else set(found[0])
+
+
+class _Descending:
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any) -> None:
+        self.key = key
+
+    def __eq__(self, other: Any) -> bool:
+        return self.key == other.key
+
+    def __lt__(self, other: Any) -> bool:
+        return other.key < self.key
+
+
+class SortIndex:
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.built = False
+        self._entries: List[Tuple[Any, int, str]] = []
+        self._keys: Dict[str, Tuple[Any, int]] = {}
+        self._seq = 0
+
+    def build(self, items: Iterable[Tuple[str, Any]]) -> None:
+        self.clear()
+        for task_id, key in items:
+            self._keys[task_id] = (key, self._seq)
+            self._entries.append((key, self._seq, task_id))
+            self._seq += 1
+        self._entries.sort()
+        self.built = True
+
+    def put(self, task_id: str, key: Any) -> None:
+        old = self._keys.get(task_id)
+        if old is not None:
+            if old[0] == key:
+                return
+            seq = old[1]
+            del self._entries[bisect.bisect_left(self._entries, (old[0], seq, task_id))]
+        else:
+            seq = self._seq
+            self._seq += 1
+        self._keys[task_id] = (key, seq)
+        bisect.insort(self._entries, (key, seq, task_id))
+
+    def remove(self, task_id: str) -> None:
+        old = self._keys.pop(task_id, None)
+        if old is not None:
+            del self._entries[bisect.bisect_left(self._entries, (old[0], old[1], task_id))]
+
+    def _span(self, low: Optional[Any], high: Optional[Any]) -> Tuple[int, int]:
+        entries = self._entries
+        start = 0 if low is None else bisect.bisect_left(entries, (low,))
+        end = len(entries) if high is None else bisect.bisect_left(entries, (high,))
+        return start, max(start, end)
+
+    def count_between(self, low: Optional[Any], high: Optional[Any]) -> int:
+        start, end = self._span(low, high)
+        return end - start
+
+    def between(self, low: Optional[Any], high: Optional[Any]) -> List[str]:
+        start, end = self._span(low, high)
+        return [entry[2] for entry in self._entries[start:end]]
+
+    def walk(self, descending: bool = False) -> Iterator[str]:
+        entries = self._entries
+        if not descending:
+            for entry in entries:
+                yield entry[2]
+            return
+        end = len(entries)
+        while end > 0:
+            start = bisect.bisect_left(entries, (entries[end - 1][0],), 0, end)
+            for i in range(start, end):
+                yield entries[i][2]
+            end = start
+
+
+class QueryResult:
+
+    def __init__(self, total: int, ordered: Iterator[str]) -> None:
+        self.total = total
+        self._ordered = ordered
+        self._ids: List[str] = []
+
+    def __len__(self) -> int:
+        return self.total
+
+    def slice(self, start: int, end: int) -> List[str]:
+        missing = min(end, self.total) - len(self._ids)
+        if missing > 0:
+            self._ids.extend(islice(self._ordered, missing))
+        return self._ids[start:end]
+
+
+def _heap_order(items: List[Tuple[Any, int, str]]) -> Iterator[str]:
+    heapq.heapify(items)
+    while items:
+        yield heapq.heappop(items)[2]
+
+
+class RecurringSchedule:
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._heap: List[Tuple[int, str]] = []
+        self._due: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def put(self, task_id: str, due_day: Optional[int]) -> None:
+        if due_day is None:
+            self._due.pop(task_id, None)
+            return
+        if self._due.get(task_id) == due_day:
+            return
+        self._due[task_id] = due_day
+        heapq.heappush(self._heap, (due_day, task_id))
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [(day, task_id) for task_id, day in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def remove(self, task_id: str) -> None:
+        self._due.pop(task_id, None)
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap and self._due.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def peek(self) -> Optional[Tuple[int, str]]:
+        self._drop_stale()
+        return self._heap[0] if self._heap else None
+
+    def pop_due(self, today: int) -> List[str]:
+        due: List[str] = []
+        heap = self._heap
+        while True:
+            self._drop_stale()
+            if not heap or heap[0][0] > today:
+                return due
+            _, task_id = heapq.heappop(heap)
+            del self._due[task_id]
+            due.append(task_id)
+
 
 class WeatherManager:
     def __init__(self, initial_location: str = "Beijing"):
@@ -381,7 +1428,7 @@ class WeatherManager:
         self.weather_data = None
         if self.data_manager:
             self.data_manager.weather_location = location
-            self.data_manager.save()
+            self.data_manager.save_settings()
     def fetch_weather(self) -> Optional[Dict]:
         try:
             url = f"https://wttr.in/{urllib.parse.quote(self.location)}?format=j1"
@@ -455,58 +1502,1496 @@ class WeatherManager:
         return code_map.get(str(code), "🌤️")
 
 
+class _JsonStreamReader:
+
+    def __init__(self, f, chunk_size: int = 1 << 16) -> None:
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, chars: str) -> str:
+        ch = self._peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"expected {chars!r}, got {ch!r}")
+        self.pos += 1
+        return ch
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self, stream_keys: Iterable[str]) -> Iterator[Tuple[str, Any, bool]]:
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key in stream_keys and self._peek() == "[":
+                self.pos += 1
+                if self._peek() == "]":
+                    self.pos += 1
+                else:
+                    while True:
+                        yield key, self._value(), True
+                        if self._expect(",]") == "]":
+                            break
+            else:
+                yield key, self._value(), False
+            if self._expect(",}") == "}":
+                return
+
+
+class TaskSnapshot:
+
+    _HEADER = struct.Struct("<4sHHIIIII")
+    _RECORD = struct.Struct("<IIIBBBxqqqII")
+    _SPAN = struct.Struct("<II")
+    _LEVELS = list(TaskLevel)
+    _TYPES = list(TaskType)
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        try:
+            (
+                magic,
+                version,
+                _flags,
+                self.checksum,
+                self.task_count,
+                self.string_count,
+                tag_ref_count,
+                settings_len,
+            ) = self._HEADER.unpack_from(self._map, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot {magic!r} version {version}")
+            self._settings_at = self._HEADER.size
+            self._offsets_at = self._settings_at + settings_len
+            self._strings_at = self._offsets_at + 4 * (self.string_count + 1)
+            strings_len = struct.unpack_from("<I", self._map, self._offsets_at + 4 * self.string_count)[0]
+            self._tags_at = self._strings_at + strings_len
+            self._records_at = self._tags_at + 4 * tag_ref_count
+            if self._records_at + self._RECORD.size * self.task_count != len(self._map):
+                raise ValueError("snapshot size does not match its header")
+        except Exception:
+            self.close()
+            raise
+        self._tag_cache: Dict[int, str] = {}
+
+    def __enter__(self) -> "TaskSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def verify(self) -> bool:
+        with memoryview(self._map) as view:
+            return zlib.crc32(view[self._HEADER.size:]) == self.checksum
+
+    def _string(self, index: int) -> str:
+        start, end = self._SPAN.unpack_from(self._map, self._offsets_at + 4 * index)
+        return self._map[self._strings_at + start:self._strings_at + end].decode("utf-8")
+
+    def _tag(self, index: int) -> str:
+        tag = self._tag_cache.get(index)
+        if tag is None:
+            tag = self._tag_cache[index] = sys.intern(self._string(index))
+        return tag
+
+    def settings(self) -> Dict[str, Any]:
+        return json.loads(self._map[self._settings_at:self._offsets_at].decode("utf-8"))
+
+    def task(self, index: int) -> Task:
+        (
+            id_ref,
+            name_ref,
+            description_ref,
+            level,
+            task_type,
+            completed,
+            created_ts,
+            completed_ts,
+            last_completed_ts,
+            tag_start,
+            tag_count,
+        ) = self._RECORD.unpack_from(self._map, self._records_at + index * self._RECORD.size)
+        tag_refs = struct.unpack_from(f"<{tag_count}I", self._map, self._tags_at + 4 * tag_start)
+        return Task.from_timestamps(
+            self._string(id_ref),
+            self._string(name_ref),
+            self._string(description_ref),
+            self._LEVELS[level],
+            self._TYPES[task_type],
+            [self._tag(ref) for ref in tag_refs],
+            created_ts,
+            bool(completed),
+            None if completed_ts == _NO_TIMESTAMP else completed_ts,
+            None if last_completed_ts == _NO_TIMESTAMP else last_completed_ts,
+        )
+
+    def members(self) -> Iterator[Tuple[str, Any, bool]]:
+        for key, value in self.settings().items():
+            yield key, value, False
+        for index in range(self.task_count):
+            yield "tasks", self.task(index), True
+
+    @classmethod
+    def write(cls, path: str, data: Dict) -> None:
+        strings: Dict[str, int] = {}
+
+        def ref(text: str) -> int:
+            index = strings.get(text)
+            if index is None:
+                index = strings[text] = len(strings)
+            return index
+
+        tasks = data["tasks"]
+        level_codes = {level: code for code, level in enumerate(cls._LEVELS)}
+        type_codes = {task_type: code for code, task_type in enumerate(cls._TYPES)}
+        tag_refs = array("I")
+        records = bytearray(cls._RECORD.size * len(tasks))
+        for index, entry in enumerate(tasks):
+            task = entry if isinstance(entry, Task) else Task.from_dict(entry)
+            cls._RECORD.pack_into(
+                records,
+                index * cls._RECORD.size,
+                ref(task.id),
+                ref(task.name),
+                ref(task.description),
+                level_codes[task.level],
+                type_codes[task.task_type],
+                int(task.completed),
+                task.created_ts,
+                _NO_TIMESTAMP if task.completed_ts is None else task.completed_ts,
+                _NO_TIMESTAMP if task.last_completed_ts is None else task.last_completed_ts,
+                len(tag_refs),
+                len(task.tags),
+            )
+            tag_refs.extend(ref(tag) for tag in task.tags)
+
+        encoded = [text.encode("utf-8") for text in strings]
+        offsets = array("I", [0])
+        total = 0
+        for chunk in encoded:
+            total += len(chunk)
+            offsets.append(total)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+            tag_refs.byteswap()
+        settings = json.dumps(
+            {key: value for key, value in data.items() if key != "tasks"},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        body = b"".join(
+            [settings, offsets.tobytes(), b"".join(encoded), tag_refs.tobytes(), bytes(records)]
+        )
+        header = cls._HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            0,
+            zlib.crc32(body),
+            len(tasks),
+            len(strings),
+            len(tag_refs),
+            len(settings),
+        )
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+
+
+class CoinLedger:
+
+    _RECORD = struct.Struct("<qIi")
+    _TOTAL = struct.Struct("<q")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.totals_path = path + ".sum"
+        self.names_path = path + ".tasks"
+        self.count = 0
+        self.total = 0
+        self._names: List[Tuple[str, str]] = []
+        self._name_index: Dict[Tuple[str, str], int] = {}
+        self._names_size = 0
+        self._views: Dict[str, mmap.mmap] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def load(self) -> None:
+        self.close()
+        self._names = []
+        self._name_index = {}
+        self._names_size = 0
+        if os.path.exists(self.names_path):
+            with open(self.names_path, "rb") as f:
+                for line in f:
+                    try:
+                        task_id, task_name = json.loads(line)
+                    except ValueError:
+                        break
+                    self._name_index[(task_id, task_name)] = len(self._names)
+                    self._names.append((task_id, task_name))
+                    self._names_size += len(line)
+
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        self.count = size // self._RECORD.size
+        if size % self._RECORD.size:
+            with open(self.path, "r+b") as f:
+                f.truncate(self.count * self._RECORD.size)
+        totals_size = os.path.getsize(self.totals_path) if os.path.exists(self.totals_path) else 0
+        if totals_size != self.count * self._TOTAL.size:
+            self._rebuild_totals()
+
+        self.total = self._running_total(self.count - 1)
+
+    def refresh(self) -> None:
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        names_size = os.path.getsize(self.names_path) if os.path.exists(self.names_path) else 0
+        if size != self.count * self._RECORD.size or names_size != self._names_size:
+            self.load()
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.close()
+        self._views = {}
+
+    def _view(self, path: str, size: int) -> mmap.mmap:
+        view = self._views.get(path)
+        if view is not None and len(view) >= size:
+            return view
+        if view is not None:
+            view.close()
+            del self._views[path]
+        with open(path, "rb") as f:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views[path] = view
+        return view
+
+    def _record(self, index: int) -> Tuple[int, int, int]:
+        view = self._view(self.path, self.count * self._RECORD.size)
+        return self._RECORD.unpack_from(view, index * self._RECORD.size)
+
+    def _timestamp(self, index: int) -> int:
+        return self._record(index)[0]
+
+    def _running_total(self, index: int) -> int:
+        if index < 0:
+            return 0
+        view = self._view(self.totals_path, self.count * self._TOTAL.size)
+        return self._TOTAL.unpack_from(view, index * self._TOTAL.size)[0]
+
+    def _rebuild_totals(self) -> None:
+        running = 0
+        chunks = []
+        for index in range(self.count):
+            running += self._record(index)[2]
+            chunks.append(self._TOTAL.pack(running))
+        view = self._views.pop(self.totals_path, None)
+        if view is not None:
+            view.close()
+        tmp_file = self.totals_path + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(b"".join(chunks))
+        os.replace(tmp_file, self.totals_path)
+
+    def append(self, entries: List[Dict]) -> None:
+        if not entries:
+            return
+        new_index: Dict[Tuple[str, str], int] = {}
+        new_names: List[Tuple[str, str]] = []
+        records = []
+        totals = []
+        total = self.total
+        for entry in entries:
+            key = (str(entry.get("task_id", "")), str(entry.get("task_name", "")))
+            index = self._name_index.get(key)
+            if index is None:
+                index = new_index.get(key)
+            if index is None:
+                index = new_index[key] = len(self._names) + len(new_names)
+                new_names.append(key)
+            ts = _to_epoch_us(entry.get("timestamp"))
+            coins = int(entry.get("coins", 0))
+            total += coins
+            records.append(self._RECORD.pack(_now_epoch_us() if ts is None else ts, index, coins))
+            totals.append(self._TOTAL.pack(total))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        names_size = self._names_size
+        if new_names:
+            with open(self.names_path, "ab") as f:
+                f.write("".join(json.dumps(list(key), ensure_ascii=False) + "\n" for key in new_names).encode("utf-8"))
+                names_size = f.tell()
+        with open(self.path, "ab") as f:
+            f.write(b"".join(records))
+        with open(self.totals_path, "ab") as f:
+            f.write(b"".join(totals))
+        self._names.extend(new_names)
+        self._name_index.update(new_index)
+        self._names_size = names_size
+        self.count += len(records)
+        self.total = total
+
+    def replace(self, entries: List[Dict]) -> None:
+        now = _now_epoch_us()
+
+        def order(entry: Dict) -> int:
+            ts = _to_epoch_us(entry.get("timestamp"))
+            return now if ts is None else ts
+
+        entries = sorted(entries, key=order)
+        self.close()
+        for path in (self.path, self.totals_path, self.names_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.load()
+        self.append(entries)
+
+    def _span(self, start: Optional[datetime], end: Optional[datetime]) -> Tuple[int, int]:
+        lo = self._bisect(_epoch_us(start)) if start else 0
+        hi = self._bisect(_epoch_us(end)) if end else self.count
+        return lo, max(lo, hi)
+
+    def _bisect(self, ts: int) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamp(mid) < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def coins_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> int:
+        lo, hi = self._span(start, end)
+        return self._running_total(hi - 1) - self._running_total(lo - 1)
+
+    def iter_range(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[Dict]:
+        lo, hi = self._span(start, end)
+        for index in range(lo, hi):
+            ts, name_ref, coins = self._record(index)
+            task_id, task_name = self._names[name_ref] if name_ref < len(self._names) else ("", "")
+            yield {
+                "task_id": task_id,
+                "task_name": task_name,
+                "coins": coins,
+                "timestamp": _from_epoch_us(ts).isoformat(),
+            }
+
+
+class _SharedFileLock:
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._mutex = threading.RLock()
+        self._depth = 0
+        self._file: Optional[IO[bytes]] = None
+
+    def __enter__(self) -> "_SharedFileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def acquire(self) -> None:
+        self._mutex.acquire()
+        self._depth += 1
+        if self._depth > 1:
+            return
+        try:
+            f = self._file = open(self.path, "a+b")
+            if sys.platform == "win32":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        except OSError as exc:
+            print(f"[DataManager] File lock unavailable: {exc}")
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            try:
+                if sys.platform == "win32":
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            except OSError:
+                pass
+            self._file.close()
+            self._file = None
+        self._mutex.release()
+
+    def reserve(self, count: int, floor: int) -> int:
+        if self._file is None:
+            return floor + 1
+        self._file.seek(0)
+        try:
+            last = int(self._file.read(32) or 0)
+        except ValueError:
+            last = 0
+        last = max(last, floor)
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(str(last + count).encode("ascii"))
+        self._file.flush()
+        return last + 1
+
+
+def _coerce_enum(enum_cls, value):
+    if isinstance(value, enum_cls):
+        return value
+    try:
+        return enum_cls[str(value).upper()]
+    except KeyError:
+        raise ValueError(f"invalid {enum_cls.__name__}: {value}") from None
+
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _base32(value: int, width: int) -> str:
+    chars = []
+    for _ in range(width):
+        chars.append(_CROCKFORD[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class TaskIdGenerator:
+    _COUNTER_LIMIT = 1 << 20
+
+    def __init__(self) -> None:
+        self.node = _base32(int.from_bytes(os.urandom(3), "big") >> 4, 4)
+        self._lock = threading.Lock()
+        self._ms = 0
+        self._counter = 0
+
+    def allocate(self, count: int = 1) -> List[str]:
+        ids: List[str] = []
+        with self._lock:
+            now_ms = time.time_ns() // 1000000
+            if now_ms > self._ms:
+                self._ms = now_ms
+                self._counter = 0
+            while count > 0:
+                if self._counter >= self._COUNTER_LIMIT:
+                    self._ms += 1
+                    self._counter = 0
+                take = min(count, self._COUNTER_LIMIT - self._counter)
+                prefix = f"task_{_base32(self._ms, 10)}"
+                ids.extend(
+                    f"{prefix}{_base32(counter, 4)}{self.node}"
+                    for counter in range(self._counter, self._counter + take)
+                )
+                self._counter += take
+                count -= take
+        return ids
+
+    def next_id(self) -> str:
+        return self.allocate(1)[0]
+
+
 class DataManager:
 
-    def __init__(self, data_file: str = "task_data.json") -> None:
+    def __init__(
+        self,
+        data_file: str = "task_data.json",
+        storage_mode: Optional[str] = None,
+        compact_threshold: int = JOURNAL_COMPACT_BYTES,
+        flush_interval: Optional[float] = None,
+        streaming: bool = False,
+    ) -> None:
         self.data_file = data_file
-        self.tasks: List[Task] = []
+        self.journal_file = self._sibling(".journal")
+        self.snapshot_file = self._sibling(".snap")
+        self._shared_lock = _SharedFileLock(self._sibling(".lock"))
+        self._data_signature: Optional[Tuple[int, int]] = None
+        self._data_digest: Optional[str] = None
+        self._origin = os.urandom(6).hex()
+        self._base_rev: Optional[str] = None
+        self._unjournaled = False
+        self._unsynced: Set[str] = set()
+        self._unsynced_coins = 0
+        self._external_changes: Set[str] = set()
+        self._tasks: Dict[str, Any] = {}
+        self._columns = TaskColumns()
+        self._schedule = RecurringSchedule()
+        self._text_index = TextIndex()
+        self._fuzzy_index = FuzzyIndex()
+        self._tag_index = TagIndex()
+        self._sort_indexes = {field: SortIndex() for field in ("level", "name", "created_at")}
+        self._collation_keys: Dict[str, Tuple[str, Any]] = {}
+        self.pinyin_collation = False
+        self.generation = 0
+        self._query_generation = -1
+        self._query_cache: Dict[Tuple[TaskFilter, int], QueryResult] = {}
+        self._id_generator = TaskIdGenerator()
+        self._reserved_ids: List[str] = []
         self.total_coins: int = 0
-        self.coin_history: List[Dict] = []
+        self.coin_ledger = CoinLedger(self._sibling(".ledger"))
         self.auto_refresh_daily: bool = True
         self.weather_location: str = "Beijing"
-        self.load()
+        self.storage_mode: str = "journal"
+        self.storage_backend: str = "json"
+        self.compact_threshold = compact_threshold
+        self.flush_interval: float = FLUSH_INTERVAL_SECONDS
+        self._journal_seq = 0
+        self._journal_size = 0
+        self._lock = threading.RLock()
+        self._compact_lock = threading.RLock()
+        self._compacting = False
+        self._dirty = False
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._batch_depth = 0
+        self._batch_thread: Optional[int] = None
+        self._batch_records: List[Tuple[str, Dict]] = []
+        self._batch_undo: Dict[str, Optional[Task]] = {}
+        self._batch_order: Optional[List[str]] = None
+        self._batch_coins = 0
+        self._save_pending = False
+        self._loader: Optional[Iterator[None]] = None
+        self._legacy_imported = False
+        self._mode_override = storage_mode
+        self._interval_override = flush_interval
+        self._stored_mode = self.storage_mode
+        self._stored_interval = self.flush_interval
+        self.load(streaming=streaming)
+        if storage_mode:
+            self.storage_mode = storage_mode
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+
+
+    def _sibling(self, suffix: str) -> str:
+        return os.path.splitext(self.data_file)[0] + suffix
 
+    @property
+    def coin_history(self) -> List[Dict]:
+        return list(self.iter_coin_history())
+
+    def load(self, streaming: bool = False) -> None:
+        self._tasks = {}
+        self._rebuild_indexes()
+        self.total_coins = 0
+        self._journal_seq = 0
+        self._loader = self._stream_data()
+        if streaming:
+            self.load_more(INITIAL_LOAD_TASKS)
+        else:
+            self._finish_loading()
 
-    def load(self) -> None:
-        if not os.path.exists(self.data_file):
-            self.tasks = []
-            self.total_coins = 0
-            self.coin_history = []
-            return
+    @property
+    def loading(self) -> bool:
+        return self._loader is not None
+
+    def load_more(self, limit: int) -> bool:
+        with self._lock:
+            if self._loader is None:
+                return True
+            for _ in range(limit):
+                try:
+                    next(self._loader)
+                except StopIteration:
+                    self._loader = None
+                    break
+            else:
+                return False
+            legacy_imported, self._legacy_imported = self._legacy_imported, False
+        if legacy_imported:
+            self._compact()
+        return True
+
+    def _finish_loading(self) -> None:
+        while not self.load_more(LOAD_CHUNK_TASKS):
+            pass
+
+    def _snapshot_current(self) -> bool:
+        if not os.path.exists(self.snapshot_file):
+            return False
+        try:
+            if os.path.exists(self.data_file) and (
+                os.path.getmtime(self.snapshot_file) < os.path.getmtime(self.data_file)
+            ):
+                return False
+            with TaskSnapshot(self.snapshot_file) as snapshot:
+                if snapshot.verify():
+                    return True
+            print("[DataManager] Snapshot checksum mismatch, loading JSON instead")
+        except Exception as exc:
+            print(f"[DataManager] Snapshot unreadable, loading JSON instead: {exc}")
+        return False
 
+    def _read_source(self, path: str, verify: bool = True) -> Iterator[Tuple[str, Any, bool]]:
+        if path.endswith(".snap"):
+            with TaskSnapshot(path) as snapshot:
+                if verify and not snapshot.verify():
+                    raise ValueError(f"snapshot checksum mismatch: {path}")
+                yield from snapshot.members()
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                yield from _JsonStreamReader(f).members(("tasks", "coin_history"))
+
+    def _stream_data(self) -> Iterator[None]:
+        legacy_history: List[Dict] = []
+        self._data_signature = self._stat(self.data_file)
+        self._data_digest = None
+        source = self.snapshot_file if self._snapshot_current() else self.data_file
+        if os.path.exists(source):
+            try:
+                for key, value, is_item in self._read_source(source, verify=False):
+                    if key == "tasks" and is_item:
+                        task_id = value.id if isinstance(value, Task) else value["id"]
+                        self._tasks[task_id] = value
+                        self._index_put(task_id, value)
+                        yield
+                    elif key == "coin_history" and is_item:
+                        legacy_history.append(value)
+                    else:
+                        self._load_setting(key, value)
+            except Exception as exc:
+                print(f"[DataManager] Load data failed: {exc}")
+                self._tasks = {}
+                self._rebuild_indexes()
+                self.total_coins = 0
+                legacy_history = []
+
+        self.coin_ledger.load()
+        if not len(self.coin_ledger):
+            self._import_legacy_history(legacy_history)
+        with self._shared_lock:
+            self._replay_journal()
+
+    def _import_legacy_history(self, legacy_history: List[Dict]) -> None:
+        if not legacy_history:
+            return
         try:
-            with open(self.data_file, "r", encoding="utf-8") as f:
-                raw = json.load(f)
+            with self._shared_lock:
+                self.coin_ledger.refresh()
+                if len(self.coin_ledger):
+                    return
+                self.coin_ledger.replace(legacy_history)
         except Exception as exc:
-            print(f"[DataManager] Load data failed: {exc}")
-            self.tasks = []
-            self.total_coins = 0
-            self.coin_history = []
+            print(f"[DataManager] Import coin history failed: {exc}")
             return
+        self._legacy_imported = True
+
+    def _load_setting(self, key: str, value: Any) -> None:
+        if key == "total_coins":
+            self.total_coins = value
+        elif key == "auto_refresh_daily":
+            self.auto_refresh_daily = value
+        elif key == "weather_location":
+            self.weather_location = value
+        elif key == "storage_mode":
+            self._stored_mode = value
+            self.storage_mode = self._mode_override or value
+        elif key == "storage_backend":
+            self.storage_backend = value
+        elif key == "flush_interval":
+            self._stored_interval = value
+            if self._interval_override is None:
+                self.flush_interval = value
+        elif key == "journal_seq":
+            self._journal_seq = value
+        elif key == "base_rev":
+            self._base_rev = value
+
+    def _index_put(self, task_id: str, entry: Any) -> None:
+        self.generation += 1
+        self._columns.put(task_id, entry)
+        self._schedule.put(task_id, self._columns.due_day(task_id))
+        fields = self._entry_fields(entry)
+        cached = self._collation_keys.get(task_id)
+        if cached is not None and cached[0] != fields[0]:
+            del self._collation_keys[task_id]
+        self._tag_index.put(task_id, fields[4])
+        if self._text_index.built:
+            self._text_index.put(task_id, fields[0], fields[1])
+        if self._fuzzy_index.built:
+            self._fuzzy_index.put(task_id, fields[0], fields[1], fields[4])
+        for sort_field, index in self._sort_indexes.items():
+            if index.built:
+                index.put(task_id, self._sort_key(sort_field, task_id, fields[0]))
+
+    def _index_remove(self, task_id: str) -> None:
+        self.generation += 1
+        self._columns.remove(task_id)
+        self._schedule.remove(task_id)
+        self._text_index.remove(task_id)
+        self._fuzzy_index.remove(task_id)
+        self._collation_keys.pop(task_id, None)
+        self._tag_index.remove(task_id)
+        for index in self._sort_indexes.values():
+            index.remove(task_id)
 
-        self.tasks = [Task.from_dict(t) for t in raw.get("tasks", [])]
-        self.total_coins = raw.get("total_coins", 0)
-        self.coin_history = raw.get("coin_history", [])
-        self.auto_refresh_daily = raw.get("auto_refresh_daily", True)
-        self.weather_location = raw.get("weather_location", "Beijing")
+    @property
+    def indexed(self) -> bool:
+        return self._text_index.pending == [] and self._fuzzy_index.pending == []
+
+    def index_more(self, limit: int) -> bool:
+        with self._lock:
+            return self._index_step(self._text_index, limit) and self._index_step(self._fuzzy_index, limit)
+
+    def _index_step(self, index: Union[TextIndex, FuzzyIndex], limit: int) -> bool:
+        if index.pending is None:
+            index.pending = list(self._tasks)
+            index.built = True
+        pending = index.pending
+        for _ in range(min(limit, len(pending))):
+            task_id = pending.pop()
+            entry = self._tasks.get(task_id)
+            if entry is None:
+                continue
+            fields = self._entry_fields(entry)
+            if isinstance(index, FuzzyIndex):
+                index.put(task_id, fields[0], fields[1], fields[4])
+            else:
+                index.put(task_id, fields[0], fields[1])
+        return not pending
+
+    def _search_index(self) -> TextIndex:
+        with self._lock:
+            while not self._index_step(self._text_index, LOAD_CHUNK_TASKS):
+                pass
+        return self._text_index
+
+    def _fuzzy_search(self, text: str) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            while not self._index_step(self._fuzzy_index, LOAD_CHUNK_TASKS):
+                pass
+        return self._fuzzy_index.search(text, FUZZY_THRESHOLD, FUZZY_CANDIDATE_LIMIT)
+
+    def _search_ids(self, keyword: str) -> Set[str]:
+        return self._search_index().search(keyword)
+
+    def _sort_key(self, field: str, task_id: str, name: Optional[str] = None) -> Any:
+        if field == "name":
+            cached = self._collation_keys.get(task_id)
+            if cached is None:
+                if name is None:
+                    name = self._entry_fields(self._tasks[task_id])[0]
+                cached = (name, _collation_key(name, self.pinyin_collation))
+                self._collation_keys[task_id] = cached
+            return cached[1]
+        columns = self._columns
+        column = columns.level if field == "level" else columns.created
+        return column[columns.rows[task_id]]
+
+    def _sort_index(self, field: str) -> SortIndex:
+        index = self._sort_indexes[field]
+        if not index.built:
+            index.build(
+                (task_id, self._sort_key(field, task_id))
+                for task_id in self._columns.ids
+                if task_id
+            )
+        return index
+
+    def _rebuild_indexes(self) -> None:
+        self.generation += 1
+        self._columns.clear()
+        self._schedule.clear()
+        self._text_index.clear()
+        self._fuzzy_index.clear()
+        self._tag_index.clear()
+        for index in self._sort_indexes.values():
+            index.clear()
+        for task_id, entry in self._tasks.items():
+            self._index_put(task_id, entry)
+
+    def _hydrate(self, task_id: str) -> Optional[Task]:
+        task = self._tasks.get(task_id)
+        if isinstance(task, dict):
+            task = Task.from_dict(task)
+            self._tasks[task_id] = task
+        return task
 
-    def save(self) -> None:
-        data = {
-            "tasks": [t.to_dict() for t in self.tasks],
-            "total_coins": self.total_coins,
-            "coin_history": self.coin_history,
+    def _replay_journal(self) -> None:
+        self._journal_size = 0
+        try:
+            self._read_journal_tail()
+        except Exception as exc:
+            print(f"[DataManager] Replay journal failed: {exc}")
+
+    def _read_journal_tail(self) -> Set[str]:
+        records, self._journal_size = self._read_journal(self._journal_size)
+        return self._apply_journal(records)
+
+    def _read_journal(self, offset: int) -> Tuple[List[Dict], int]:
+        records: List[Dict] = []
+        if not os.path.exists(self.journal_file):
+            return records, 0
+        with open(self.journal_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size < offset:
+                offset = 0
+            f.seek(offset)
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+            return records, f.tell()
+
+    def _apply_journal(self, records: List[Dict]) -> Set[str]:
+        changed: Set[str] = set()
+        applied = self._journal_seq
+        for record in records:
+            seq = record.get("seq", 0)
+            if seq <= applied:
+                continue
+            self._journal_seq = max(self._journal_seq, seq)
+            ids = self._record_ids(record.get("op"), record)
+            if record.get("origin") != self._origin:
+                self._apply_record(record)
+                changed.update(ids)
+            elif changed.intersection(ids):
+                if record.get("op") == "complete":
+                    self._apply_record({"op": "put", "task": record["task"]})
+                else:
+                    self._apply_record(record)
+                changed.difference_update(ids)
+        return changed
+
+    @staticmethod
+    def _record_ids(op: Optional[str], payload: Dict) -> List[str]:
+        if op in ("put", "complete"):
+            return [payload["task"]["id"]]
+        if op == "del":
+            return [payload["id"]]
+        if op == "reset":
+            return list(payload["ids"])
+        return []
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _digest(path: str) -> Optional[str]:
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def _sync_external(self) -> Set[str]:
+        changed: Set[str] = set()
+        try:
+            signature = self._stat(self.data_file)
+            if signature != self._data_signature:
+                changed |= self._merge_data_file()
+                self._data_signature = signature
+            changed |= self._read_journal_tail()
+            self.coin_ledger.refresh()
+        except Exception as exc:
+            print(f"[DataManager] Sync external changes failed: {exc}")
+        self._external_changes |= changed
+        return changed
+
+    def _read_header(self, path: str) -> Dict[str, Any]:
+        settings: Dict[str, Any] = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for key, value, is_item in _JsonStreamReader(f).members(("tasks", "coin_history")):
+                if is_item:
+                    break
+                settings[key] = value
+        return settings
+
+    def _merge_data_file(self) -> Set[str]:
+        header = self._read_header(self.data_file)
+        folded = header.get("journal_seq", 0)
+        base_rev = header.get("base_rev")
+        if base_rev is not None and base_rev == self._base_rev and folded <= self._journal_seq:
+            self._journal_size = 0
+            return set()
+        digest = self._digest(self.data_file)
+        if digest == self._data_digest:
+            return set()
+        self._data_digest = digest
+
+        records, _ = self._read_journal(0)
+        unfolded = [record for record in records if record.get("seq", 0) > folded]
+        keep = set(self._unsynced)
+        for record in unfolded:
+            keep.update(self._record_ids(record.get("op"), record))
+        changed: Set[str] = set()
+        seen: Set[str] = set()
+        settings: Dict[str, Any] = {}
+        source = self.snapshot_file if self._snapshot_current() else self.data_file
+        for key, value, is_item in self._read_source(source, verify=False):
+            if key == "tasks" and is_item:
+                task_id = value.id if isinstance(value, Task) else value["id"]
+                seen.add(task_id)
+                if task_id in keep:
+                    continue
+                current = self._tasks.get(task_id)
+                if current is not None:
+                    before = current if isinstance(current, dict) else current.to_dict()
+                    after = value if isinstance(value, dict) else value.to_dict()
+                    if before == after:
+                        continue
+                self._tasks[task_id] = value
+                self._index_put(task_id, value)
+                changed.add(task_id)
+            elif key in ("total_coins", "auto_refresh_daily", "weather_location", "base_rev"):
+                settings[key] = value
+        for task_id in [t for t in self._tasks if t not in seen and t not in keep]:
+            del self._tasks[task_id]
+            self._index_remove(task_id)
+            changed.add(task_id)
+        for key, value in settings.items():
+            self._load_setting(key, value)
+        self.total_coins += self._unsynced_coins + sum(
+            record["entry"]["coins"]
+            for record in unfolded
+            if record.get("op") == "complete"
+            and (record.get("seq", 0) <= self._journal_seq or record.get("origin") == self._origin)
+        )
+        self._journal_seq = max(self._journal_seq, folded)
+        self._journal_size = 0
+        return changed
+
+    def poll_external_changes(self) -> Set[str]:
+        with self._lock:
+            if self._loader is None and (
+                self._stat(self.data_file) != self._data_signature
+                or (self._stat(self.journal_file) or (0, 0))[1] != self._journal_size
+            ):
+                with self._shared_lock:
+                    self._sync_external()
+                if self._dirty:
+                    self._wake.set()
+            changed, self._external_changes = self._external_changes, set()
+        return changed
+
+    def _apply_record(self, record: Dict) -> None:
+        op = record.get("op")
+        if op == "put":
+            task = Task.from_dict(record["task"])
+            self._tasks[task.id] = task
+            self._index_put(task.id, task)
+        elif op == "del":
+            if self._tasks.pop(record["id"], None) is not None:
+                self._index_remove(record["id"])
+        elif op == "complete":
+            self._apply_record({"op": "put", "task": record["task"]})
+            self.total_coins += record["entry"]["coins"]
+            if not record.get("in_ledger"):
+                self.coin_ledger.append([record["entry"]])
+        elif op == "reset":
+            for task_id in record["ids"]:
+                reset = self._hydrate(task_id)
+                if reset:
+                    reset.last_completed = None
+                    self._index_put(task_id, reset)
+        elif op == "settings":
+            self.auto_refresh_daily = record.get("auto_refresh_daily", self.auto_refresh_daily)
+            self.weather_location = record.get("weather_location", self.weather_location)
+
+    def _snapshot_data(self) -> Dict:
+        data = self._snapshot_settings()
+        data["tasks"] = [t if isinstance(t, dict) else t.to_dict() for t in self._tasks.values()]
+        return data
+
+    def _snapshot_settings(self) -> Dict:
+        return {
             "auto_refresh_daily": self.auto_refresh_daily,
             "weather_location": self.weather_location,
+            "storage_mode": (
+                self._stored_mode if self.storage_mode == self._mode_override else self.storage_mode
+            ),
+            "storage_backend": self.storage_backend,
+            "flush_interval": (
+                self._stored_interval
+                if self.flush_interval == self._interval_override
+                else self.flush_interval
+            ),
+            "journal_seq": self._journal_seq,
+            "base_rev": self._base_rev,
+            "total_coins": self.total_coins,
         }
+
+    def iter_coin_history(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[Dict]:
+        return self.coin_ledger.iter_range(start, end)
+
+    def coins_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> int:
+        return self.coin_ledger.coins_between(start, end)
+
+    def export_data(self, path: str) -> None:
+        self._finish_loading()
+        with self._lock:
+            data = self._snapshot_data()
+            data["coin_history"] = list(self.iter_coin_history())
+        for key in ("journal_seq", "base_rev"):
+            data.pop(key, None)
+        if path.endswith(".snap"):
+            TaskSnapshot.write(path, data)
+            return
+        tmp_file = path + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, path)
+
+    def _read_import(self, path: str) -> Tuple[List[Task], Optional[List[Dict]]]:
+        tasks = []
+        history: Optional[List[Dict]] = None
+        settings = {}
+        for key, value, is_item in self._read_source(path):
+            if key == "tasks" and is_item:
+                tasks.append(value if isinstance(value, Task) else Task.from_dict(value))
+            elif key == "coin_history":
+                if history is None:
+                    history = []
+                if is_item:
+                    history.append(value)
+                else:
+                    history.extend(value)
+            elif key in ("total_coins", "auto_refresh_daily", "weather_location"):
+                settings[key] = value
+        for key, value in settings.items():
+            self._load_setting(key, value)
+        return tasks, history
+
+    def import_data(self, path: str) -> None:
+        self._finish_loading()
+        with self._lock:
+            tasks, history = self._read_import(path)
+            if history is not None:
+                with self._shared_lock:
+                    try:
+                        self.coin_ledger.replace(history)
+                        self.total_coins = self.coin_ledger.total
+                    except Exception as exc:
+                        print(f"[DataManager] Import coin history failed: {exc}")
+            self._tasks = {task.id: task for task in tasks}
+            self._rebuild_indexes()
+            self._unjournaled = True
+        self.save()
+
+    def save(self) -> None:
+        self._finish_loading()
+        with self._lock:
+            self._dirty = False
+            if self._batch_depth:
+                self._save_pending = True
+                return
+            self._save_pending = False
+        if not self._compact():
+            self._mark_dirty()
+
+    def _save_if_pending(self) -> None:
+        with self._lock:
+            if not self._save_pending or self._batch_depth:
+                return
+        self.save()
+
+    def save_settings(self) -> None:
+        self._record(
+            "settings",
+            auto_refresh_daily=self.auto_refresh_daily,
+            weather_location=self.weather_location,
+        )
+        self._save_if_pending()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+        if not self._compact():
+            with self._lock:
+                self._dirty = True
+
+    def close(self) -> None:
+        self._closing.set()
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join(timeout=10)
+        with self._compact_lock, self._lock, self._shared_lock:
+            self.poll_external_changes()
+            self.flush()
+        self.coin_ledger.close()
+
+    def _mark_dirty(self) -> None:
+        with self._lock:
+            self._dirty = True
+            if self._writer is None and not self._closing.is_set():
+                self._writer = threading.Thread(target=self._write_behind_loop, daemon=True)
+                self._writer.start()
+        self._wake.set()
+
+    def _write_behind_loop(self) -> None:
+        last_flush = 0.0
+        while not self._closing.is_set():
+            self._wake.wait()
+            delay = last_flush + self.flush_interval - time.monotonic()
+            if delay > 0 and self._closing.wait(delay):
+                return
+            if self._closing.is_set():
+                return
+            self._wake.clear()
+            self.flush()
+            last_flush = time.monotonic()
+
+    def _record(self, op: str, **payload) -> None:
+        if self._batch_depth:
+            self._batch_records.append((op, payload))
+            return
+        self._commit_records([(op, payload)])
+
+    def _commit_records(self, records: List[Tuple[str, Dict]]) -> None:
+        if not records:
+            return
+        should_compact = False
+        with self._lock, self._shared_lock:
+            entries = [payload["entry"] for op, payload in records if op == "complete"]
+            if entries:
+                try:
+                    self.coin_ledger.refresh()
+                    self.coin_ledger.append(entries)
+                except Exception as exc:
+                    print(f"[DataManager] Coin ledger write failed: {exc}")
+                for op, payload in records:
+                    if op == "complete":
+                        payload["in_ledger"] = True
+            if self.storage_mode == "write_behind":
+                self._unjournaled = True
+                for op, payload in records:
+                    self._unsynced.update(self._record_ids(op, payload))
+                self._unsynced_coins += sum(entry["coins"] for entry in entries)
+                self._mark_dirty()
+                return
+            if self.storage_mode == "journal":
+                seq = self._shared_lock.reserve(len(records), self._journal_seq)
+                lines = []
+                for op, payload in records:
+                    payload["seq"] = seq
+                    payload["op"] = op
+                    payload["origin"] = self._origin
+                    seq += 1
+                    lines.append(json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n")
+                try:
+                    with open(self.journal_file, "ab") as f:
+                        start = f.tell()
+                        f.write("".join(lines).encode("utf-8"))
+                        end = f.tell()
+                except Exception as exc:
+                    print(f"[DataManager] Journal write failed: {exc}")
+                    return
+                if start == self._journal_size:
+                    self._journal_size = end
+                    self._journal_seq = seq - 1
+                should_compact = end >= self.compact_threshold and not self._compacting
+                if should_compact:
+                    self._compacting = True
+            else:
+                self._unjournaled = True
+                self._save_pending = True
+
+        if should_compact:
+            threading.Thread(target=self._compact, daemon=True).start()
+
+    def _compact(self) -> bool:
+        with self._compact_lock:
+            with self._lock:
+                if (
+                    self._stat(self.data_file) != self._data_signature
+                    or (self._stat(self.journal_file) or (0, 0))[1] != self._journal_size
+                ):
+                    self._compacting = False
+                    return False
+                unjournaled, self._unjournaled = self._unjournaled, False
+                data = self._snapshot_settings()
+                if unjournaled or self._base_rev is None:
+                    data["base_rev"] = os.urandom(8).hex()
+                data["tasks"] = [t if isinstance(t, dict) else t.to_dict() for t in self._tasks.values()]
+                signature = self._data_signature
+                folded_size = self._journal_size
+                synced, self._unsynced = self._unsynced, set()
+                synced_coins, self._unsynced_coins = self._unsynced_coins, 0
+
+            tmp_file = f"{self.data_file}.{self._origin}.tmp"
+            tmp_snapshot = f"{self.snapshot_file}.{self._origin}.tmp"
+            try:
+                content = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+                with open(tmp_file, "wb") as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception as exc:
+                print(f"[DataManager] Save data failed: {exc}")
+                return self._compact_failed(synced, synced_coins, unjournaled)
+            try:
+                TaskSnapshot.write(tmp_snapshot, data)
+                snapshot_written = True
+            except Exception as exc:
+                print(f"[DataManager] Save snapshot failed: {exc}")
+                snapshot_written = False
+
+            with self._lock, self._shared_lock:
+                try:
+                    if self._stat(self.data_file) != signature:
+                        for path in (tmp_file, tmp_snapshot):
+                            if os.path.exists(path):
+                                os.remove(path)
+                        return self._compact_failed(synced, synced_coins, unjournaled)
+                    os.replace(tmp_file, self.data_file)
+                except Exception as exc:
+                    print(f"[DataManager] Save data failed: {exc}")
+                    return self._compact_failed(synced, synced_coins, unjournaled)
+                self._data_signature = self._stat(self.data_file)
+                self._data_digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+                self._base_rev = data["base_rev"]
+                if snapshot_written:
+                    try:
+                        os.replace(tmp_snapshot, self.snapshot_file)
+                    except Exception as exc:
+                        print(f"[DataManager] Save snapshot failed: {exc}")
+                self._truncate_journal(folded_size)
+                self._compacting = False
+            return True
+
+    def _compact_failed(self, synced: Set[str], synced_coins: int, unjournaled: bool) -> bool:
+        with self._lock:
+            self._compacting = False
+            self._unjournaled |= unjournaled
+            self._unsynced |= synced
+            self._unsynced_coins += synced_coins
+        return False
+
+    def _truncate_journal(self, folded_size: int) -> None:
         try:
-            with open(self.data_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(self.journal_file, "rb") as f:
+                f.seek(folded_size)
+                tail = f.read()
+            if tail:
+                tmp_file = self.journal_file + ".tmp"
+                with open(tmp_file, "wb") as f:
+                    f.write(tail)
+                os.replace(tmp_file, self.journal_file)
+            else:
+                os.remove(self.journal_file)
+            self._journal_size = max(0, self._journal_size - folded_size)
+        except FileNotFoundError:
+            self._journal_size = 0
         except Exception as exc:
-            print(f"[DataManager] Save data failed: {exc}")
+            print(f"[DataManager] Truncate journal failed: {exc}")
+
+
+    @contextmanager
+    def batch(self) -> Iterator["DataManager"]:
+        self._finish_loading()
+        with self._lock:
+            self._batch_depth += 1
+            if self._batch_depth == 1:
+                self._batch_thread = threading.get_ident()
+                self._batch_records = []
+                self._batch_undo = {}
+                self._batch_order = None
+                self._batch_coins = self.total_coins
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._batch_thread = None
+                    self._rollback_batch()
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth:
+                return
+            self._batch_thread = None
+            records = self._batch_records
+            self._batch_records = []
+            self._batch_undo = {}
+            self._batch_order = None
+            self._commit_records(records)
+        self._save_if_pending()
+
+    def _in_batch(self) -> bool:
+        return bool(self._batch_depth) and self._batch_thread == threading.get_ident()
+
+    def _remember(self, task_id: str, deleting: bool = False) -> None:
+        if not self._batch_depth:
+            return
+        if deleting and self._batch_order is None:
+            self._batch_order = list(self._tasks)
+        if task_id not in self._batch_undo:
+            task = self._tasks.get(task_id)
+            if isinstance(task, Task):
+                task = task.to_dict()
+            self._batch_undo[task_id] = Task.from_dict(task) if task else None
+
+    def _rollback_batch(self) -> None:
+        for task_id, before in self._batch_undo.items():
+            if before is None:
+                self._tasks.pop(task_id, None)
+            else:
+                self._tasks[task_id] = before
+        if self._batch_order is not None:
+            self._tasks = {
+                task_id: self._tasks[task_id]
+                for task_id in self._batch_order
+                if task_id in self._tasks
+            }
+        self._rebuild_indexes()
+        self.total_coins = self._batch_coins
+        self._batch_records = []
+        self._batch_undo = {}
+        self._batch_order = None
+
+    def create_tasks(self, specs: Iterable[Dict[str, Any]]) -> List[BatchResult]:
+        results = []
+        specs = list(specs)
+        self.reserve_ids(len(specs))
+        try:
+            with self.batch():
+                for spec in specs:
+                    name = str(spec.get("name", "")).strip()
+                    if not name:
+                        raise ValueError("task name cannot be empty")
+                    task = self.create_task(
+                        name,
+                        spec.get("description", ""),
+                        _coerce_enum(TaskLevel, spec.get("level", TaskLevel.NORMAL)),
+                        _coerce_enum(TaskType, spec.get("task_type", TaskType.ONCE)),
+                        spec.get("tags"),
+                    )
+                    results.append(BatchResult(task.id, True))
+        finally:
+            self._reserved_ids.clear()
+        return results
+
+    def update_tasks(self, changes: Dict[str, Dict[str, Any]]) -> List[BatchResult]:
+        results = []
+        with self.batch():
+            for task_id, fields in changes.items():
+                task = self._hydrate(task_id)
+                if task is None:
+                    raise ValueError(f"task not found: {task_id}")
+                unknown = set(fields) - {"name", "description", "level", "task_type", "tags"}
+                if unknown:
+                    raise ValueError(f"cannot update fields: {', '.join(sorted(unknown))}")
+                self._remember(task_id)
+                if "name" in fields:
+                    task.name = str(fields["name"]).strip()
+                    if not task.name:
+                        raise ValueError("task name cannot be empty")
+                if "description" in fields:
+                    task.description = fields["description"]
+                if "level" in fields:
+                    task.level = _coerce_enum(TaskLevel, fields["level"])
+                if "task_type" in fields:
+                    task.task_type = _coerce_enum(TaskType, fields["task_type"])
+                if "tags" in fields:
+                    task.tags = list(fields["tags"] or [])
+                self.update_task(task)
+                results.append(BatchResult(task_id, True))
+        return results
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> List[BatchResult]:
+        results = []
+        with self.batch():
+            for task_id in task_ids:
+                if task_id not in self._tasks:
+                    raise ValueError(f"task not found: {task_id}")
+                self.delete_task(task_id)
+                results.append(BatchResult(task_id, True))
+        return results
+
+    def complete_tasks(self, task_ids: Iterable[str]) -> List[BatchResult]:
+        results = []
+        with self.batch():
+            for task_id in task_ids:
+                if task_id not in self._tasks:
+                    raise ValueError(f"task not found: {task_id}")
+                coins = self.complete_task(task_id)
+                if coins:
+                    results.append(BatchResult(task_id, True, coins))
+                else:
+                    results.append(BatchResult(task_id, False, error="cannot complete"))
+        return results
 
 
+    def reserve_ids(self, count: int) -> None:
+        if count > 0:
+            self._reserved_ids.extend(reversed(self._id_generator.allocate(count)))
+
     def _new_id(self) -> str:
-        return f"task_{datetime.now().timestamp()}"
+        while True:
+            if self._reserved_ids:
+                task_id = self._reserved_ids.pop()
+            else:
+                task_id = self._id_generator.next_id()
+            if task_id not in self._tasks:
+                return task_id
 
     def create_task(
         self,
@@ -516,6 +3001,7 @@ class DataManager:
         task_type: TaskType,
         tags: Optional[Iterable[str]] = None,
     ) -> Task:
+        self._finish_loading()
         task = Task(
             id=self._new_id(),
             name=name,
@@ -524,80 +3010,686 @@ class DataManager:
             task_type=task_type,
             tags=list(tags or []),
         )
-        self.tasks.append(task)
-        self.save()
+        with self._lock:
+            self._remember(task.id)
+            self._tasks[task.id] = task
+            self._index_put(task.id, task)
+            self._record("put", task=task.to_dict())
+        self._save_if_pending()
         return task
 
     def update_task(self, task: Task) -> None:
-        for idx, t in enumerate(self.tasks):
-            if t.id == task.id:
-                self.tasks[idx] = task
-                self.save()
+        self._finish_loading()
+        with self._lock:
+            if task.id not in self._tasks:
                 return
+            self._remember(task.id)
+            self._tasks[task.id] = task
+            self._index_put(task.id, task)
+            self._record("put", task=task.to_dict())
+        self._save_if_pending()
 
     def delete_task(self, task_id: str) -> None:
-        self.tasks = [t for t in self.tasks if t.id != task_id]
-        self.save()
+        self._finish_loading()
+        with self._lock:
+            if task_id not in self._tasks:
+                return
+            self._remember(task_id, deleting=True)
+            del self._tasks[task_id]
+            self._index_remove(task_id)
+            self._record("del", id=task_id)
+        self._save_if_pending()
 
 
     def complete_task(self, task_id: str) -> int:
-        task = next((t for t in self.tasks if t.id == task_id), None)
-        if not task:
-            return 0
-
-        if not task.mark_completed():
-            return 0
-
-        coins = task.level.reward
-        self.total_coins += coins
-        self.coin_history.append(
-            {
+        self._finish_loading()
+        with self._lock:
+            task = self._hydrate(task_id)
+            if not task:
+                return 0
+
+            self._remember(task_id)
+            if not task.mark_completed():
+                return 0
+            self._index_put(task_id, task)
+
+            coins = task.level.reward
+            entry = {
                 "task_id": task.id,
                 "task_name": task.name,
                 "coins": coins,
                 "timestamp": datetime.now().isoformat(),
             }
-        )
-        self.save()
+            self.total_coins += coins
+            self._record("complete", task=task.to_dict(), entry=entry)
+        self._save_if_pending()
         return coins
 
 
-    def iter_tasks(self) -> Iterable[Task]:
-        return list(self.tasks)
+    @property
+    def tasks(self) -> List[Task]:
+        return list(self.iter_tasks())
+
+    def get_task(self, task_id: Optional[str]) -> Optional[Task]:
+        if task_id is None:
+            return None
+        if self._in_batch():
+            self._remember(task_id)
+        return self._hydrate(task_id)
+
+    def iter_tasks(self) -> Iterator[Task]:
+        in_batch = self._in_batch()
+        for task_id, task in self._tasks.items():
+            if in_batch:
+                self._remember(task_id)
+            if isinstance(task, dict):
+                task = Task.from_dict(task)
+                self._tasks[task_id] = task
+            yield task
 
     def count_all(self) -> int:
-        return len(self.tasks)
+        return len(self._tasks)
+
+    @staticmethod
+    def _entry_fields(entry: Any) -> Tuple[str, str, str, str, List[str], Any, bool, bool]:
+        if isinstance(entry, dict):
+            return (
+                entry["name"],
+                entry.get("description", ""),
+                entry["level"],
+                entry["task_type"],
+                entry.get("tags", []),
+                entry,
+                entry.get("completed", False),
+                bool(entry.get("last_completed")),
+            )
+        return (
+            entry.name,
+            entry.description,
+            entry.level.name,
+            entry.task_type.name,
+            entry.tags,
+            entry,
+            entry.completed,
+            entry.last_completed_ts is not None,
+        )
+
+    def query_tasks(self, flt: TaskFilter) -> List[Task]:
+        tasks = (self._hydrate(task_id) for task_id in self.query_task_ids(flt))
+        return [task for task in tasks if task is not None]
+
+    def query_task_ids(self, flt: TaskFilter) -> List[str]:
+        result = self._query(flt)
+        return result.slice(0, result.total)
+
+    def query_page(self, flt: TaskFilter, start: int, end: int) -> Tuple[List[str], int]:
+        result = self._query(flt)
+        return result.slice(start, end), result.total
+
+    def _query(self, flt: TaskFilter) -> QueryResult:
+        cache = self._query_cache
+        if self._query_generation != self.generation:
+            cache.clear()
+            self._query_generation = self.generation
+        key = (flt, _today_day_number())
+        result = cache.get(key)
+        if result is None:
+            result = self._run_query(flt)
+            if len(cache) >= QUERY_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[key] = result
+        return result
+
+    def explain(self, flt: TaskFilter) -> str:
+        steps: List[str] = []
+        self._run_query(flt, steps)
+        return "\n".join(steps)
+
+    def _estimate(self, term: QueryTerm) -> int:
+        columns = self._columns
+        if term.field == "tag":
+            return sum(self._tag_index.count(key) for key in term.value)
+        if term.field == "text":
+            return self._search_index().estimate(term.value)
+        if term.field == "level":
+            return columns.level_counts.get(term.value, 0)
+        if term.field == "type":
+            return columns.type_counts[term.value]
+        if term.field == "created":
+            return self._sort_index("created_at").count_between(*term.value)
+        available, cooldown = columns.status_counts()
+        return {"available": available, "cooldown": cooldown}.get(term.value, columns.completed_count)
+
+    def _term_ids(self, term: QueryTerm) -> Iterable[str]:
+        if term.field == "tag":
+            return self._tag_index.ids(term.value)
+        if term.field == "text":
+            return self._search_ids(term.value)
+        if term.field == "level":
+            return self._sort_index("level").between(term.value, term.value + 1)
+        return self._sort_index("created_at").between(*term.value)
+
+    def _term_rows(self, term: QueryTerm, rows: Optional[List[int]]) -> List[int]:
+        columns = self._columns
+        if term.field in ("tag", "text"):
+            hits = self._term_ids(term)
+            ids = columns.ids
+            if rows is None:
+                rows = columns.match()
+            if term.negated:
+                return [row for row in rows if ids[row] not in hits]
+            return [row for row in rows if ids[row] in hits]
+        keep = columns.match(
+            level=term.value if term.field == "level" else None,
+            type_code=term.value if term.field == "type" else None,
+            status=term.value if term.field == "status" else None,
+            created=term.value if term.field == "created" else None,
+            candidates=rows,
+        )
+        if not term.negated:
+            return keep
+        dropped = set(keep)
+        return [row for row in (columns.match() if rows is None else rows) if row not in dropped]
+
+    def _run_query(self, flt: TaskFilter, steps: Optional[List[str]] = None) -> QueryResult:
+        columns = self._columns
+        query = _compile_filter(flt)
+        ranked = sorted(
+            (
+                (term.negated, self._estimate(term), position, term)
+                for position, term in enumerate(query.terms)
+                if term.field != "fuzzy"
+            ),
+            key=lambda item: item[:3],
+        )
+        rows = None
+        ranks = None
+        indexed = [
+            item for item in ranked
+            if not item[0] and item[3].field in ("tag", "text", "level", "created")
+        ]
+        fuzzy = [term for term in query.terms if term.field == "fuzzy"]
+        if fuzzy:
+            ranks = self._fuzzy_search(fuzzy[0].value)
+            rows = [columns.rows[task_id] for task_id in ranks]
+            rows.sort()
+            if steps is not None:
+                steps.append(f"fuzzy {fuzzy[0].source}: {len(rows)} rows scored")
+        elif indexed and indexed[0][1] * SORT_INDEX_RATIO < len(columns):
+            ranked.remove(indexed[0])
+            _, estimate, _, driver = indexed[0]
+            rows = sorted(columns.rows[task_id] for task_id in self._term_ids(driver))
+            if steps is not None:
+                steps.append(f"index {driver.source}: ~{estimate} -> {len(rows)} rows")
+        elif steps is not None:
+            steps.append(f"scan: {len(columns)} rows")
+        for _, estimate, _, term in ranked:
+            rows = self._term_rows(term, rows)
+            if steps is not None:
+                action = "exclude" if term.negated else "check"
+                steps.append(f"{action} {term.source}: ~{estimate} -> {len(rows)} rows")
+        if rows is None:
+            rows = columns.match()
+
+        ids = columns.ids
+        sort_field = query.sort_field
+        descending = bool(query.descending)
+        if sort_field not in self._sort_indexes and ranks is not None:
+            if steps is not None:
+                steps.append("order: relevance")
+            ranking = [(ranks[ids[row]], row, ids[row]) for row in rows]
+            return QueryResult(len(rows), _heap_order(ranking))
+        if sort_field not in self._sort_indexes:
+            if steps is not None:
+                steps.append("order: insertion")
+            return QueryResult(len(rows), (ids[row] for row in rows))
+        direction = "desc" if descending else "asc"
+        if len(rows) * SORT_INDEX_RATIO >= len(columns):
+            ordered = self._sort_index(sort_field).walk(descending)
+            if len(rows) < len(columns):
+                wanted = {ids[row] for row in rows}
+                ordered = (task_id for task_id in ordered if task_id in wanted)
+            if steps is not None:
+                steps.append(f"order: {sort_field} {direction} by index walk")
+            return QueryResult(len(rows), ordered)
+        wrap = _Descending if descending else None
+        items = []
+        for row in rows:
+            key = self._sort_key(sort_field, ids[row])
+            items.append((wrap(key) if wrap else key, row, ids[row]))
+        if steps is not None:
+            steps.append(f"order: {sort_field} {direction} by heap top-k")
+        return QueryResult(len(rows), _heap_order(items))
+
+    def set_name_collation(self, pinyin: bool) -> None:
+        pinyin = pinyin and _HAS_PYPINYIN
+        with self._lock:
+            if pinyin == self.pinyin_collation:
+                return
+            self.pinyin_collation = pinyin
+            self._collation_keys.clear()
+            self._sort_indexes["name"].clear()
+            self.generation += 1
+
+    def suggest_tags(self, prefix: str = "", limit: int = 10) -> List[Tuple[str, int]]:
+        return self._tag_index.suggest(prefix, limit)
+
+    def tag_count(self, tag: str) -> int:
+        return self._tag_index.count(tag)
 
     def refresh_daily_tasks(self) -> int:
-        count = 0
-        now = datetime.now()
-        for task in self.tasks:
-            if task.task_type == TaskType.DAILY and task.last_completed:
-                last_dt = datetime.fromisoformat(task.last_completed)
-                if now.date() > last_dt.date():
-                    task.last_completed = None
-                    count += 1
-        if count > 0:
-            self.save()
-        return count
+        return len(self.reset_due_tasks())
+
+    def reset_due_tasks(self) -> List[str]:
+        self._finish_loading()
+        with self._lock:
+            reset_ids = self._schedule.pop_due(_today_day_number())
+            for task_id in reset_ids:
+                entry = self._hydrate(task_id)
+                if entry is None:
+                    continue
+                self._remember(task_id)
+                entry.last_completed_ts = None
+                self._index_put(task_id, entry)
+            if reset_ids:
+                self._record("reset", ids=reset_ids)
+        self._save_if_pending()
+        return reset_ids
+
+    def next_available(self) -> Optional[Tuple[datetime, str]]:
+        with self._lock:
+            head = self._schedule.peek()
+        if head is None:
+            return None
+        return _EPOCH + timedelta(days=head[0]), head[1]
 
     def count_completed_for_progress(self) -> int:
-        count = 0
-        for t in self.tasks:
-            if t.is_once and t.completed:
-                count += 1
-            elif not t.is_once and t.last_completed:
-                count += 1
-        return count
+        return self._columns.progress_count
+
+    def board_stats(self) -> BoardStats:
+        columns = self._columns
+        available, cooldown = columns.status_counts()
+        return BoardStats(
+            total=len(columns),
+            completed=columns.completed_count,
+            progress=columns.progress_count,
+            available=available,
+            cooldown=cooldown,
+            by_level={
+                level.name: columns.level_counts.get(level.order, 0) for level in TaskLevel
+            },
+            by_type={
+                task_type.name: columns.type_counts[_TYPE_CODES[task_type.name]]
+                for task_type in TaskType
+            },
+        )
+
+
+
+
+class SQLiteDataManager(DataManager):
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '',
+            level TEXT NOT NULL,
+            level_order INTEGER NOT NULL,
+            task_type TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            completed INTEGER NOT NULL DEFAULT 0,
+            completed_at TEXT,
+            last_completed TEXT
+        );
+        CREATE TABLE IF NOT EXISTS task_tags (
+            task_id TEXT NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            tag TEXT NOT NULL,
+            tag_key TEXT NOT NULL,
+            PRIMARY KEY (task_id, position)
+        );
+        CREATE TABLE IF NOT EXISTS coin_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id TEXT NOT NULL,
+            task_name TEXT NOT NULL,
+            coins INTEGER NOT NULL,
+            timestamp TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_level ON tasks(level_order);
+        CREATE INDEX IF NOT EXISTS idx_tasks_type ON tasks(task_type);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_last_completed ON tasks(last_completed);
+        CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag_key);
+        CREATE INDEX IF NOT EXISTS idx_coin_history_timestamp ON coin_history(timestamp);
+    """
+
+    def __init__(self, db_file: str = "task_data.db") -> None:
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.create_function("py_lower", 1, lambda v: (v or "").lower())
+        self.conn.executescript(self._SCHEMA)
+        super().__init__(data_file=db_file, storage_mode="sqlite")
+        self.storage_backend = "sqlite"
+
+    def _sibling(self, suffix: str) -> str:
+        return self.db_file + suffix
+
+
+    def load(self, streaming: bool = False) -> None:
+        rows = self.conn.execute(
+            "SELECT id, name, description, level, task_type, created_at,"
+            " completed, completed_at, last_completed FROM tasks ORDER BY seq"
+        ).fetchall()
+        tags: Dict[str, List[str]] = {}
+        for task_id, tag in self.conn.execute(
+            "SELECT task_id, tag FROM task_tags ORDER BY task_id, position"
+        ):
+            tags.setdefault(task_id, []).append(tag)
+
+        tasks = [
+            Task(
+                id=row[0],
+                name=row[1],
+                description=row[2],
+                level=TaskLevel[row[3]],
+                task_type=TaskType[row[4]],
+                tags=tags.get(row[0], []),
+                created_at=row[5],
+                completed=bool(row[6]),
+                completed_at=row[7],
+                last_completed=row[8],
+            )
+            for row in rows
+        ]
+        self._tasks = {t.id: t for t in tasks}
+        self._rebuild_indexes()
+
+        settings = dict(self.conn.execute("SELECT key, value FROM settings"))
+        self.total_coins = int(settings.get("total_coins", 0))
+        self.auto_refresh_daily = settings.get("auto_refresh_daily", "1") == "1"
+        self.weather_location = settings.get("weather_location", "Beijing")
+
+    def save(self) -> None:
+        with self._lock:
+            try:
+                with self.conn:
+                    self._write_settings()
+            except sqlite3.Error as exc:
+                print(f"[SQLiteDataManager] Save data failed: {exc}")
+
+    def migrate_from_json(self, source: DataManager) -> bool:
+        with self._lock:
+            try:
+                with self.conn:
+                    for task in source.iter_tasks():
+                        self._write_task(task)
+                    self.conn.executemany(
+                        "INSERT INTO coin_history (task_id, task_name, coins, timestamp)"
+                        " VALUES (?, ?, ?, ?)",
+                        [
+                            (e.get("task_id", ""), e.get("task_name", ""), e.get("coins", 0), e.get("timestamp", ""))
+                            for e in source.iter_coin_history()
+                        ],
+                    )
+                    self.total_coins = source.total_coins
+                    self.auto_refresh_daily = source.auto_refresh_daily
+                    self.weather_location = source.weather_location
+                    self._write_settings()
+            except sqlite3.Error as exc:
+                print(f"[SQLiteDataManager] Migrate data failed: {exc}")
+                return False
+            self.load()
+            return True
+
+    def import_data(self, path: str) -> None:
+        with self._lock:
+            tasks, history = self._read_import(path)
+            try:
+                with self.conn:
+                    self.conn.execute("DELETE FROM tasks")
+                    for task in tasks:
+                        self._write_task(task)
+                    if history is not None:
+                        self.conn.execute("DELETE FROM coin_history")
+                        self.conn.executemany(
+                            "INSERT INTO coin_history (task_id, task_name, coins, timestamp)"
+                            " VALUES (?, ?, ?, ?)",
+                            [
+                                (e.get("task_id", ""), e.get("task_name", ""), e.get("coins", 0), e.get("timestamp", ""))
+                                for e in history
+                            ],
+                        )
+                        self.total_coins = sum(int(e.get("coins", 0)) for e in history)
+                    self._write_settings()
+            except sqlite3.Error as exc:
+                print(f"[SQLiteDataManager] Import data failed: {exc}")
+            self.load()
+
+    def _write_settings(self) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+            [
+                ("total_coins", str(self.total_coins)),
+                ("auto_refresh_daily", "1" if self.auto_refresh_daily else "0"),
+                ("weather_location", self.weather_location),
+            ],
+        )
+
+    def _write_task(self, task: Task) -> None:
+        values = (
+            task.name,
+            task.description,
+            task.level.name,
+            task.level.order,
+            task.task_type.name,
+            task.created_at,
+            int(task.completed),
+            task.completed_at,
+            task.last_completed,
+            task.id,
+        )
+        cur = self.conn.execute(
+            "UPDATE tasks SET name = ?, description = ?, level = ?, level_order = ?,"
+            " task_type = ?, created_at = ?, completed = ?, completed_at = ?,"
+            " last_completed = ? WHERE id = ?",
+            values,
+        )
+        if cur.rowcount == 0:
+            self.conn.execute(
+                "INSERT INTO tasks (name, description, level, level_order, task_type,"
+                " created_at, completed, completed_at, last_completed, id)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values,
+            )
+        self.conn.execute("DELETE FROM task_tags WHERE task_id = ?", (task.id,))
+        self.conn.executemany(
+            "INSERT INTO task_tags (task_id, position, tag, tag_key) VALUES (?, ?, ?, ?)",
+            [(task.id, pos, tag, _tag_key(tag)) for pos, tag in enumerate(task.tags)],
+        )
+
+    def _commit_records(self, records: List[Tuple[str, Dict]]) -> None:
+        try:
+            with self.conn:
+                for op, payload in records:
+                    self._write_record(op, payload)
+        except sqlite3.Error as exc:
+            print(f"[SQLiteDataManager] Write failed: {exc}")
+
+    def _write_record(self, op: str, payload: Dict) -> None:
+        if op == "put":
+            self._write_task(Task.from_dict(payload["task"]))
+        elif op == "del":
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (payload["id"],))
+        elif op == "complete":
+            entry = payload["entry"]
+            self._write_task(Task.from_dict(payload["task"]))
+            self.conn.execute(
+                "INSERT INTO coin_history (task_id, task_name, coins, timestamp)"
+                " VALUES (?, ?, ?, ?)",
+                (entry["task_id"], entry["task_name"], entry["coins"], entry["timestamp"]),
+            )
+            self._write_settings()
+        elif op == "reset":
+            self.conn.executemany(
+                "UPDATE tasks SET last_completed = NULL WHERE id = ?",
+                [(task_id,) for task_id in payload["ids"]],
+            )
+        elif op == "settings":
+            self._write_settings()
+
+    def iter_coin_history(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[Dict]:
+        sql = "SELECT task_id, task_name, coins, timestamp FROM coin_history WHERE 1 = 1"
+        params: List = []
+        if start:
+            sql += " AND timestamp >= ?"
+            params.append(start.isoformat())
+        if end:
+            sql += " AND timestamp < ?"
+            params.append(end.isoformat())
+        for task_id, task_name, coins, timestamp in self.conn.execute(sql + " ORDER BY id", params):
+            yield {"task_id": task_id, "task_name": task_name, "coins": coins, "timestamp": timestamp}
+
+    def coins_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> int:
+        sql = "SELECT COALESCE(SUM(coins), 0) FROM coin_history WHERE 1 = 1"
+        params: List = []
+        if start:
+            sql += " AND timestamp >= ?"
+            params.append(start.isoformat())
+        if end:
+            sql += " AND timestamp < ?"
+            params.append(end.isoformat())
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def poll_external_changes(self) -> Set[str]:
+        return set()
+
+    _AVAILABLE_SQL = (
+        "((t.task_type = 'ONCE' AND t.completed = 0)"
+        " OR (t.task_type != 'ONCE' AND (t.last_completed IS NULL"
+        " OR (t.task_type = 'DAILY' AND t.last_completed < ?)"
+        " OR (t.task_type = 'WEEKLY' AND t.last_completed < ?))))"
+    )
+
+    @staticmethod
+    def _cooldown_cutoffs() -> Tuple[str, str]:
+        today = date.today()
+        return (
+            datetime.combine(today, datetime.min.time()).isoformat(),
+            datetime.combine(today - timedelta(days=6), datetime.min.time()).isoformat(),
+        )
 
+    _TYPE_NAMES = {code: name for name, code in _TYPE_CODES.items()}
 
+    def _term_sql(self, term: QueryTerm) -> Tuple[str, List]:
+        if term.field == "text":
+            return (
+                "(instr(py_lower(t.name), ?) > 0 OR instr(py_lower(t.description), ?) > 0)",
+                [term.value, term.value],
+            )
+        if term.field == "level":
+            return "t.level_order = ?", [term.value]
+        if term.field == "type":
+            return "t.task_type = ?", [self._TYPE_NAMES[term.value]]
+        if term.field == "tag":
+            marks = ", ".join("?" * len(term.value))
+            return f"t.id IN (SELECT task_id FROM task_tags WHERE tag_key IN ({marks}))", list(term.value)
+        if term.field == "created":
+            low, high = term.value
+            clauses = []
+            params = []
+            if low is not None:
+                clauses.append("t.created_at >= ?")
+                params.append((_EPOCH + timedelta(microseconds=low)).isoformat())
+            if high is not None:
+                clauses.append("t.created_at < ?")
+                params.append((_EPOCH + timedelta(microseconds=high)).isoformat())
+            return "(" + " AND ".join(clauses) + ")", params
+        if term.value == "completed":
+            return "(t.task_type = 'ONCE' AND t.completed = 1)", []
+        available = self._AVAILABLE_SQL
+        if term.value == "cooldown":
+            available = f"(t.task_type != 'ONCE' AND t.last_completed IS NOT NULL AND NOT {available})"
+        return available, list(self._cooldown_cutoffs())
+
+    def _run_query(self, flt: TaskFilter, steps: Optional[List[str]] = None) -> QueryResult:
+        query = _compile_filter(flt)
+        if any(term.field == "fuzzy" for term in query.terms):
+            return super()._run_query(flt, steps)
+        sql = ["SELECT t.id FROM tasks t WHERE 1 = 1"]
+        params: List = []
+        for term in query.terms:
+            clause, values = self._term_sql(term)
+            sql.append(f"AND NOT {clause}" if term.negated else f"AND {clause}")
+            params += values
+        direction = "DESC" if query.descending else "ASC"
+        column = {"level": "t.level_order", "created_at": "t.created_at"}.get(query.sort_field or "")
+        if column:
+            sql.append(f"ORDER BY {column} {direction}, t.seq")
+        else:
+            sql.append("ORDER BY t.seq")
+        text = " ".join(sql)
+        if steps is not None:
+            steps.append(f"sql: {text}")
+            for row in self.conn.execute("EXPLAIN QUERY PLAN " + text, params):
+                steps.append(f"plan: {row[-1]}")
+        task_ids = [row[0] for row in self.conn.execute(text, params) if row[0] in self._tasks]
+        if query.sort_field == "name":
+            task_ids.sort(key=lambda task_id: self._sort_key("name", task_id), reverse=bool(query.descending))
+            if steps is not None:
+                steps.append(f"order: name {direction.lower()} by collation key")
+        return QueryResult(len(task_ids), iter(task_ids))
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+def open_data_manager(data_file: str = "task_data.json", streaming: bool = False) -> DataManager:
+    data = DataManager(data_file, streaming=streaming)
+    if data.storage_backend != "sqlite":
+        return data
+
+    data._finish_loading()
+    db = SQLiteDataManager(os.path.splitext(data_file)[0] + ".db")
+    migrate = bool(data.count_all() or len(data.coin_ledger) or data.total_coins)
+    if migrate and not db.migrate_from_json(data):
+        db.close()
+        return data
+    data.close()
+    if migrate:
+        ledger = data.coin_ledger
+        for path in (
+            data.data_file,
+            data.journal_file,
+            data.snapshot_file,
+            ledger.path,
+            ledger.totals_path,
+            ledger.names_path,
+        ):
+            if os.path.exists(path):
+                os.replace(path, path + ".migrated")
+        try:
+            with open(data.data_file, "w", encoding="utf-8") as f:
+                json.dump({"storage_backend": "sqlite"}, f, ensure_ascii=False, indent=2)
+        except Exception as exc:
+            print(f"[DataManager] Write backend setting failed: {exc}")
+    return db
 
 
 class TaskManagerApp:
 
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
-        self.data = DataManager()
+        self.data = open_data_manager(streaming=True)
         self.weather = WeatherManager(initial_location=self.data.weather_location)
         self.weather.set_data_manager(self.data)
         self.i18n = I18n("en")
@@ -607,15 +3699,22 @@ class TaskManagerApp:
         self.calendar_month = datetime.now().month
 
         self.search_var = tk.StringVar()
+        self.fuzzy_search = False
         self.filter_level_var = tk.StringVar(value=self.i18n.t("all"))
         self.filter_type_var = tk.StringVar(value=self.i18n.t("all"))
+        self.filter_status_var = tk.StringVar(value=self.i18n.t("all"))
         self.filter_tag_var = tk.StringVar()
         self.sort_field_var = tk.StringVar(value=self.i18n.t("default"))
         self.sort_order_var = tk.StringVar(value=self.i18n.t("desc"))
 
         self.current_page = 1
         self.page_size = 6
-        self.filtered_tasks: List[Task] = []
+        self.page_task_ids: List[str] = []
+        self.filtered_total = 0
+        self._filter_job: Optional[str] = None
+        self._applied_filter: Optional[TaskFilter] = None
+        self.last_query_ms = 0.0
+        self._task_cards: Dict[str, tk.Frame] = {}
 
         self.task_list_frame: tk.Frame
         self.task_list_canvas: tk.Canvas
@@ -635,12 +3734,71 @@ class TaskManagerApp:
         self.view_toggle_btn: tk.Button
 
         self.selected_task_id: Optional[str] = None
+        self._rollover_job: Optional[str] = None
+        self._indexing = False
 
         self._build_ui()
-        self._check_daily_refresh()
         self.refresh_task_list()
         self.update_stats()
         self._update_weather()
+        if self.data.loading:
+            self.root.after(1, self._continue_loading)
+        else:
+            self._arm_rollover()
+            self._start_indexing()
+        self.root.after(EXTERNAL_POLL_MS, self._poll_external_changes)
+        self.root.bind("<FocusIn>", self._on_wake, add="+")
+        self.root.bind("<Map>", self._on_wake, add="+")
+
+    def _continue_loading(self) -> None:
+        if self.data.load_more(LOAD_CHUNK_TASKS):
+            self.refresh_task_list()
+            self._arm_rollover()
+            self._start_indexing()
+            return
+        self.update_stats()
+        self.root.after(1, self._continue_loading)
+
+    def _start_indexing(self) -> None:
+        if not self._indexing and not self.data.indexed:
+            self._indexing = True
+            self.root.after(1, self._continue_indexing)
+
+    def _continue_indexing(self) -> None:
+        if self.data.index_more(INDEX_CHUNK_TASKS):
+            self._indexing = False
+            return
+        self.root.after(1, self._continue_indexing)
+
+    def _poll_external_changes(self) -> None:
+        changed = self.data.poll_external_changes()
+        if changed:
+            self._apply_external_changes(changed)
+        if not self.data.loading:
+            self._start_indexing()
+        self.root.after(EXTERNAL_POLL_MS, self._poll_external_changes)
+
+    def _apply_external_changes(self, changed: Set[str]) -> None:
+        try:
+            task_ids, total = self._query_page(self._current_filter())
+        except ValueError:
+            task_ids, total = [], 0
+        if total != self.filtered_total or task_ids != self.page_task_ids:
+            self.refresh_task_list()
+        else:
+            for task_id in changed:
+                card = self._task_cards.get(task_id)
+                task = self.data.get_task(task_id)
+                if card is not None and task is not None:
+                    self._task_cards[task_id] = self._render_task_card(task, before=card)
+                    card.destroy()
+            self.update_stats()
+
+        if self.selected_task_id in changed:
+            if self.data.get_task(self.selected_task_id):
+                self.select_task(self.selected_task_id)
+            else:
+                self.clear_selection()
 
 
     def _build_ui(self) -> None:
@@ -652,6 +3810,7 @@ class TaskManagerApp:
         self.root.bind("<Control-f>", lambda _e: self.focus_search())
         self.root.bind("<F5>", lambda _e: self.refresh_task_list())
         self.root.bind("<Escape>", lambda _e: self.clear_selection())
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
         style = ttk.Style()
         style.theme_use("clam")
@@ -725,6 +3884,10 @@ class TaskManagerApp:
         self.calendar_frame = tk.Frame(middle, bg=colors["bg"])
         self._build_detail_panel(middle)
 
+    def _on_close(self) -> None:
+        self.data.close()
+        self.root.destroy()
+
     @property
     def _colors(self) -> Dict[str, str]:
         return {
@@ -1009,7 +4172,21 @@ class TaskManagerApp:
             bd=2,
         )
         entry.pack(side=tk.LEFT)
-        entry.bind("<KeyRelease>", lambda _e: self.filter_tasks())
+        entry.bind("<KeyRelease>", self._schedule_filter)
+        self.search_mode_btn = tk.Button(
+            search_bar,
+            text=self.i18n.t("exact"),
+            font=("Microsoft YaHei", 9, "bold"),
+            bg=c["button_secondary"],
+            fg=c["fg_white"],
+            activebackground=c["button_secondary_hover"],
+            activeforeground=c["fg_white"],
+            bd=2,
+            relief=tk.RAISED,
+            cursor="hand2",
+            command=self._toggle_search_mode,
+        )
+        self.search_mode_btn.pack(side=tk.LEFT, padx=(4, 0))
 
         filter_row = tk.Frame(panel, bg=c["panel"])
         filter_row.pack(fill=tk.X, padx=8, pady=(0, 6))
@@ -1056,6 +4233,22 @@ class TaskManagerApp:
         self.type_menu.pack(side=tk.LEFT, padx=4)
         self.type_menu.bind("<<ComboboxSelected>>", lambda _e: self.filter_tasks())
 
+        status_values = [
+            self.i18n.t("all"),
+            self.i18n.t("available"),
+            self.i18n.t("cooldown"),
+            self.i18n.t("completed"),
+        ]
+        self.status_menu = ttk.Combobox(
+            filter_row,
+            textvariable=self.filter_status_var,
+            values=status_values,
+            width=10,
+            state="readonly",
+        )
+        self.status_menu.pack(side=tk.LEFT, padx=4)
+        self.status_menu.bind("<<ComboboxSelected>>", lambda _e: self.filter_tasks())
+
         self.tag_label = tk.Label(
             filter_row,
             text=self.i18n.t("tag"),
@@ -1065,18 +4258,16 @@ class TaskManagerApp:
         )
         self.tag_label.pack(side=tk.LEFT, padx=(10, 4))
 
-        tag_entry = tk.Entry(
+        self.tag_menu = ttk.Combobox(
             filter_row,
             textvariable=self.filter_tag_var,
             font=("Microsoft YaHei", 10),
             width=12,
-            bg=c["bg_light"],
-            fg=c["fg"],
-            relief=tk.RAISED,
-            bd=2,
+            postcommand=self._update_tag_suggestions,
         )
-        tag_entry.pack(side=tk.LEFT, padx=4)
-        tag_entry.bind("<KeyRelease>", lambda _e: self.filter_tasks())
+        self.tag_menu.pack(side=tk.LEFT, padx=4)
+        self.tag_menu.bind("<KeyRelease>", self._schedule_filter)
+        self.tag_menu.bind("<<ComboboxSelected>>", lambda _e: self.filter_tasks())
 
         self.sort_label = tk.Label(
             filter_row,
@@ -1311,74 +4502,102 @@ class TaskManagerApp:
         self.refresh_task_list()
 
     def filter_tasks(self) -> None:
+        self._cancel_scheduled_filter()
         self.current_page = 1
         self.refresh_task_list()
 
-    def refresh_task_list(self) -> None:
-        for w in self.task_list_frame.winfo_children():
-            w.destroy()
-
-        tasks = list(self.data.iter_tasks())
-
-        keyword = self.search_var.get().strip().lower()
-        if keyword:
-            tasks = [
-                t
-                for t in tasks
-                if keyword in t.name.lower()
-                or keyword in t.description.lower()
-            ]
+    def _schedule_filter(self, _event: Optional[tk.Event] = None) -> None:
+        self._cancel_scheduled_filter()
+        self._filter_job = self.root.after(FILTER_DEBOUNCE_MS, self._run_scheduled_filter)
+
+    def _cancel_scheduled_filter(self) -> None:
+        if self._filter_job is not None:
+            self.root.after_cancel(self._filter_job)
+            self._filter_job = None
+
+    def _run_scheduled_filter(self) -> None:
+        self._filter_job = None
+        if self._current_filter() != self._applied_filter:
+            self.filter_tasks()
+
+    def _toggle_search_mode(self) -> None:
+        self.fuzzy_search = not self.fuzzy_search
+        self.search_mode_btn.config(text=self.i18n.t("fuzzy" if self.fuzzy_search else "exact"))
+        self.filter_tasks()
+
+    def _update_tag_suggestions(self) -> None:
+        text = self.filter_tag_var.get()
+        cut = max(text.rfind(","), text.rfind("|"))
+        head, partial = text[:cut + 1], text[cut + 1:]
+        lead = partial[:len(partial) - len(partial.lstrip())]
+        partial = partial.strip()
+        if partial.startswith("-"):
+            lead += "-"
+            partial = partial[1:]
+        self.tag_menu["values"] = [
+            f"{head}{lead}{label}" for label, _count in self.data.suggest_tags(partial)
+        ]
 
-        lv = self.filter_level_var.get()
+    def _current_filter(self) -> TaskFilter:
         level_map = {
             self.i18n.t("simple"): TaskLevel.SIMPLE,
             self.i18n.t("normal"): TaskLevel.NORMAL,
             self.i18n.t("hard"): TaskLevel.HARD,
             self.i18n.t("epic"): TaskLevel.EPIC,
         }
-        if lv in level_map:
-            tasks = [t for t in tasks if t.level == level_map[lv]]
-
-        tp = self.filter_type_var.get()
         type_map = {
             self.i18n.t("once"): TaskType.ONCE,
             self.i18n.t("daily"): TaskType.DAILY,
             self.i18n.t("weekly"): TaskType.WEEKLY,
         }
-        if tp in type_map:
-            tasks = [t for t in tasks if t.task_type == type_map[tp]]
-
-        tag_text = self.filter_tag_var.get().strip().lower()
-        if tag_text:
-            wanted = [s.strip() for s in tag_text.split(",") if s.strip()]
-            if wanted:
-                tasks = [
-                    t
-                    for t in tasks
-                    if all(
-                        any(tag.lower() == w for tag in t.tags)
-                        for w in wanted
-                    )
-                ]
-
-        reverse = self.sort_order_var.get() == self.i18n.t("desc")
-        field = self.sort_field_var.get()
-        if field == self.i18n.t("level"):
-            tasks.sort(key=lambda t: t.level.order, reverse=reverse)
-        elif field == self.i18n.t("name"):
-            tasks.sort(key=lambda t: t.name, reverse=reverse)
-        elif field == self.i18n.t("create_time"):
-            tasks.sort(key=lambda t: t.created_at, reverse=reverse)
+        status_map = {
+            self.i18n.t("available"): "available",
+            self.i18n.t("cooldown"): "cooldown",
+            self.i18n.t("completed"): "completed",
+        }
+        sort_map = {
+            self.i18n.t("level"): "level",
+            self.i18n.t("name"): "name",
+            self.i18n.t("create_time"): "created_at",
+        }
+        tag_text = self.filter_tag_var.get().strip()
+        wanted = [s.strip() for s in tag_text.split(",") if s.strip()]
+        return TaskFilter(
+            query=self.search_var.get().strip(),
+            fuzzy=self.fuzzy_search,
+            level=level_map.get(self.filter_level_var.get()),
+            task_type=type_map.get(self.filter_type_var.get()),
+            tags=tuple(wanted),
+            status=status_map.get(self.filter_status_var.get()),
+            sort_field=sort_map.get(self.sort_field_var.get(), "default"),
+            descending=self.sort_order_var.get() == self.i18n.t("desc"),
+        )
 
-        self.filtered_tasks = tasks
+    def refresh_task_list(self) -> None:
+        for w in self.task_list_frame.winfo_children():
+            w.destroy()
+        self._task_cards = {}
 
-        total = len(tasks)
+        flt = self._current_filter()
+        started = time.perf_counter()
+        query_error = ""
+        try:
+            task_ids, total = self._query_page(flt)
+            total_pages = max(1, (total + self.page_size - 1) // self.page_size)
+            page = max(1, min(self.current_page, total_pages))
+            if page != self.current_page:
+                self.current_page = page
+                task_ids, total = self._query_page(flt)
+        except ValueError as exc:
+            task_ids, total, query_error = [], 0, str(exc)
         total_pages = max(1, (total + self.page_size - 1) // self.page_size)
-        self.current_page = max(1, min(self.current_page, total_pages))
+        self.current_page = min(self.current_page, total_pages)
 
-        start = (self.current_page - 1) * self.page_size
-        end = start + self.page_size
-        page_tasks = tasks[start:end]
+        self.page_task_ids = task_ids
+        self.filtered_total = total
+        self._applied_filter = flt
+        self.last_query_ms = (time.perf_counter() - started) * 1000
+        page_tasks = [t for t in map(self.data.get_task, task_ids) if t is not None]
 
         if not page_tasks:
             empty_text = f"{self.i18n.t('all')} {self.i18n.t('total_tasks')}\n{self.i18n.t('add_task')} ✨"
@@ -1392,12 +4611,13 @@ class TaskManagerApp:
             ).pack(pady=40)
         else:
             for t in page_tasks:
-                self._render_task_card(t)
+                self._task_cards[t.id] = self._render_task_card(t)
 
         page_text = self.i18n.t("page", page=self.current_page, total=total_pages)
         total_text = self.i18n.t("total_items", total=total)
+        detail = query_error or f"{total_text}, {self.last_query_ms:.1f} ms"
         self.page_info_label.config(
-            text=f"{page_text} ({total_text})"
+            text=f"{page_text} ({detail})"
         )
         self.prev_btn.config(state=tk.NORMAL if self.current_page > 1 else tk.DISABLED)
         self.next_btn.config(
@@ -1412,11 +4632,18 @@ class TaskManagerApp:
 
         self.update_stats()
 
-    def _render_task_card(self, task: Task) -> None:
+    def _query_page(self, flt: TaskFilter) -> Tuple[List[str], int]:
+        start = (self.current_page - 1) * self.page_size
+        return self.data.query_page(flt, start, start + self.page_size)
+
+    def _render_task_card(self, task: Task, before: Optional[tk.Widget] = None) -> tk.Frame:
         c = self._colors
 
         shadow = tk.Frame(self.task_list_frame, bg=c["shadow"], bd=0, relief=tk.FLAT)
-        shadow.pack(fill=tk.X, padx=8, pady=5)
+        if before is not None:
+            shadow.pack(fill=tk.X, padx=8, pady=5, before=before)
+        else:
+            shadow.pack(fill=tk.X, padx=8, pady=5)
 
         level_colors = {
             TaskLevel.SIMPLE: ("#f0e68c", "#d4af37"),
@@ -1455,7 +4682,7 @@ class TaskManagerApp:
         name_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
         state_text = self._get_task_status_text(task)
-        state_bg = c["accent_dark"] if task.completed or (task.last_completed and not task.can_complete) else c["panel_dark"]
+        state_bg = c["accent_dark"] if task.completed or (task.last_completed_ts is not None and not task.can_complete) else c["panel_dark"]
         state_badge = tk.Label(
             top,
             text=state_text,
@@ -1527,7 +4754,7 @@ class TaskManagerApp:
         created_text = self.i18n.t("created_at_label").replace("：", "").replace(":", "")
         tk.Label(
             inner,
-            text=f"{created_text}：{datetime.fromisoformat(task.created_at).strftime('%m-%d %H:%M')}",
+            text=f"{created_text}：{task.created_dt.strftime('%m-%d %H:%M')}",
             font=("Microsoft YaHei", 8),
             bg=bg_color,
             fg=c["fg"],
@@ -1547,6 +4774,7 @@ class TaskManagerApp:
             w.bind("<Button-1>", on_click)
             w.bind("<Enter>", on_enter)
             w.bind("<Leave>", on_leave)
+        return shadow
 
 
     def _set_detail_text(self, text: str) -> None:
@@ -1557,7 +4785,7 @@ class TaskManagerApp:
 
     def select_task(self, task_id: str) -> None:
         self.selected_task_id = task_id
-        task = next((t for t in self.data.iter_tasks() if t.id == task_id), None)
+        task = self.data.get_task(task_id)
         if not task:
             return
 
@@ -1580,16 +4808,18 @@ class TaskManagerApp:
             "",
             "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
             "",
-            f"📅 {self.i18n.t('created_at_label')}：{datetime.fromisoformat(task.created_at).strftime('%Y-%m-%d %H:%M')}",
+            f"📅 {self.i18n.t('created_at_label')}：{task.created_dt.strftime('%Y-%m-%d %H:%M')}",
         ]
 
-        if task.last_completed:
+        last_completed = task.last_completed_dt
+        if last_completed is not None:
             info.append(
-                f"✅ {self.i18n.t('last_completed_label')}：{datetime.fromisoformat(task.last_completed).strftime('%Y-%m-%d %H:%M')}"
+                f"✅ {self.i18n.t('last_completed_label')}：{last_completed.strftime('%Y-%m-%d %H:%M')}"
             )
-        if task.completed_at:
+        completed = task.completed_dt
+        if completed is not None:
             info.append(
-                f"✅ {self.i18n.t('one_time_completed')}：{datetime.fromisoformat(task.completed_at).strftime('%Y-%m-%d %H:%M')}"
+                f"✅ {self.i18n.t('one_time_completed')}：{completed.strftime('%Y-%m-%d %H:%M')}"
             )
 
         info.append("")
@@ -1611,10 +4841,7 @@ class TaskManagerApp:
             if not self.selected_task_id:
                 messagebox.showwarning(self.i18n.t("warning"), self.i18n.t("select_task_to_edit"))
                 return
-            current = next(
-                (t for t in self.data.iter_tasks() if t.id == self.selected_task_id),
-                None,
-            )
+            current = self.data.get_task(self.selected_task_id)
             if not current:
                 messagebox.showwarning(self.i18n.t("warning"), self.i18n.t("task_not_found"))
                 return
@@ -1767,13 +4994,14 @@ class TaskManagerApp:
             tags = [s.strip() for s in tags_var.get().split(",") if s.strip()]
 
             if is_edit and current:
-                current.name = name
-                current.description = description
-                current.level = level
-                current.task_type = ttype
-                current.tags = tags
-                self.data.update_task(current)
-                self.select_task(current.id)
+                edited = Task.from_dict(current.to_dict())
+                edited.name = name
+                edited.description = description
+                edited.level = level
+                edited.task_type = ttype
+                edited.tags = tags
+                self.data.update_task(edited)
+                self.select_task(edited.id)
             else:
                 task = self.data.create_task(name, description, level, ttype, tags)
                 self.selected_task_id = task.id
@@ -1816,9 +5044,7 @@ class TaskManagerApp:
         if not self.selected_task_id:
             messagebox.showwarning(self.i18n.t("warning"), self.i18n.t("select_task_first"))
             return
-        task = next(
-            (t for t in self.data.iter_tasks() if t.id == self.selected_task_id), None
-        )
+        task = self.data.get_task(self.selected_task_id)
         if not task:
             return
         if not messagebox.askyesno(self.i18n.t("confirm_delete"), self.i18n.t("delete_confirm_msg", task_name=task.name)):
@@ -1843,26 +5069,52 @@ class TaskManagerApp:
 
 
     def update_stats(self) -> None:
-        total = self.data.count_all()
-        completed_for_progress = self.data.count_completed_for_progress()
+        stats = self.data.board_stats()
 
         self.coin_label.config(text=str(self.data.total_coins))
-        self.total_task_label.config(text=str(total))
-        self.completed_label.config(text=str(completed_for_progress))
+        self.total_task_label.config(text=str(stats.total))
+        self.completed_label.config(text=str(stats.progress))
 
-        if total:
-            pct = completed_for_progress * 100.0 / total
-        else:
-            pct = 0.0
+        pct = stats.percent
         self.progress_var.set(pct)
         self.progress_label.config(text=f"{pct:.1f}%")
-    def _check_daily_refresh(self) -> None:
-        today = date.today()
-        if self.data.auto_refresh_daily and today > self.last_daily_refresh_date:
-            count = self.data.refresh_daily_tasks()
-            if count > 0:
-                self.last_daily_refresh_date = today
-                self.refresh_task_list()
+    def _arm_rollover(self) -> None:
+        if self._rollover_job is not None:
+            self.root.after_cancel(self._rollover_job)
+            self._rollover_job = None
+        if self.data.loading:
+            return
+        now = datetime.now()
+        target = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        if self.data.auto_refresh_daily:
+            upcoming = self.data.next_available()
+            if upcoming is not None and upcoming[0] < target:
+                target = upcoming[0]
+        delay = max(0, (target - now) // timedelta(milliseconds=1) + 1)
+        self._rollover_job = self.root.after(delay, self._rollover)
+
+    def _on_wake(self, event: Optional[tk.Event] = None) -> None:
+        if event is not None and event.widget is not self.root:
+            return
+        if date.today() != self.last_daily_refresh_date:
+            self._rollover()
+        else:
+            self._arm_rollover()
+
+    def _rollover(self) -> None:
+        self._rollover_job = None
+        if self.data.loading:
+            return
+        self.last_daily_refresh_date = date.today()
+        if self.data.auto_refresh_daily:
+            reset_ids = self.data.reset_due_tasks()
+            if reset_ids:
+                self._apply_external_changes(set(reset_ids))
+        else:
+            self.refresh_task_list()
+        if self.current_view == "calendar":
+            self._build_calendar()
+        self._arm_rollover()
     def _update_weather(self) -> None:
         def fetch():
             weather = self.weather.fetch_weather()
@@ -1893,6 +5145,7 @@ class TaskManagerApp:
     def _toggle_language(self) -> None:
         new_lang = "en" if self.i18n.lang == "zh" else "zh"
         self.i18n.set_language(new_lang)
+        self.data.set_name_collation(new_lang == "zh")
         self._refresh_ui_texts()
     def _get_task_level_text(self, level: TaskLevel) -> str:
         level_map = {
@@ -1914,7 +5167,7 @@ class TaskManagerApp:
             return self.i18n.t("completed") if task.completed else self.i18n.t("in_progress")
         if task.can_complete:
             return self.i18n.t("available")
-        if task.last_completed:
+        if task.last_completed_ts is not None:
             return self.i18n.t("cooldown")
         return self.i18n.t("in_progress")
     def _refresh_ui_texts(self) -> None:
@@ -1946,6 +5199,8 @@ class TaskManagerApp:
             self.task_list_title.config(text=self.i18n.t("task_list"))
         if hasattr(self, 'task_detail_title'):
             self.task_detail_title.config(text=self.i18n.t("task_detail"))
+        if hasattr(self, 'search_mode_btn'):
+            self.search_mode_btn.config(text=self.i18n.t("fuzzy" if self.fuzzy_search else "exact"))
         if hasattr(self, 'filter_label'):
             self.filter_label.config(text=self.i18n.t("filter"))
         if hasattr(self, 'tag_label'):
@@ -1983,6 +5238,21 @@ class TaskManagerApp:
                 self.filter_type_var.set(type_map.get(current_type, self.i18n.t("all")))
             elif current_type not in type_values:
                 self.filter_type_var.set(self.i18n.t("all"))
+        if hasattr(self, 'status_menu'):
+            status_values = [
+                self.i18n.t("all"),
+                self.i18n.t("available"),
+                self.i18n.t("cooldown"),
+                self.i18n.t("completed"),
+            ]
+            current_status = self.filter_status_var.get()
+            self.status_menu.config(values=status_values)
+            if current_status in ["可完成", "冷却中", "已完成"]:
+                status_map = {"可完成": self.i18n.t("available"), "冷却中": self.i18n.t("cooldown"),
+                              "已完成": self.i18n.t("completed")}
+                self.filter_status_var.set(status_map.get(current_status, self.i18n.t("all")))
+            elif current_status not in status_values:
+                self.filter_status_var.set(self.i18n.t("all"))
         if hasattr(self, 'sort_menu'):
             sort_values = [
                 self.i18n.t("default"),
@@ -2006,7 +5276,7 @@ class TaskManagerApp:
             self.next_btn.config(text=self.i18n.t("next"))
         if hasattr(self, 'complete_btn'):
             if self.selected_task_id:
-                task = next((t for t in self.data.iter_tasks() if t.id == self.selected_task_id), None)
+                task = self.data.get_task(self.selected_task_id)
                 if task:
                     if task.can_complete:
                         self.complete_btn.config(state=tk.NORMAL, text=self.i18n.t("complete_task"))
@@ -2143,6 +5413,13 @@ class TaskManagerApp:
                 fg=c["fg"],
                 width=10,
             ).pack(side=tk.LEFT, padx=2)
+        daily_count = self.data.board_stats().by_type[TaskType.DAILY.name]
+        daily_names = []
+        if daily_count:
+            for task_id in self.data.query_page(TaskFilter(task_type=TaskType.DAILY), 0, 3)[0]:
+                task = self.data.get_task(task_id)
+                if task is not None:
+                    daily_names.append(task.name)
         cal = monthcalendar(year, month)
         for week in cal:
             week_frame = tk.Frame(self.calendar_frame, bg=c["panel"])
@@ -2165,14 +5442,10 @@ class TaskManagerApp:
                     fg=day_color,
                 )
                 day_label.pack(anchor="nw", padx=4, pady=2)
-                day_tasks = [
-                    t for t in self.data.iter_tasks()
-                    if t.task_type == TaskType.DAILY
-                ]
-                if day_tasks:
-                    task_text = "\n".join([f"• {t.name[:8]}" for t in day_tasks[:3]])
-                    if len(day_tasks) > 3:
-                        task_text += f"\n+{len(day_tasks)-3}"
+                if daily_count:
+                    task_text = "\n".join([f"• {name[:8]}" for name in daily_names])
+                    if daily_count > 3:
+                        task_text += f"\n+{daily_count-3}"
                     tk.Label(
                         day_frame,
                         text=task_text,
@@ -2289,6 +5562,7 @@ class TaskManagerApp:
         dialog.bind("<Escape>", lambda _e: dialog.destroy())
     def _manual_refresh_daily(self) -> None:
         count = self.data.refresh_daily_tasks()
+        self._arm_rollover()
         if count > 0:
             messagebox.showinfo(self.i18n.t("daily_task_reset"), f"{self.i18n.t('daily_task_reset')}: {count} tasks")
             self.refresh_task_list()
@@ -2299,6 +5573,37 @@ class TaskManagerApp:
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Little Hero Task Board")
+    commands = parser.add_subparsers(dest="command")
+    export_parser = commands.add_parser("export", help="write all tasks to a .json or .snap file")
+    export_parser.add_argument("path")
+    import_parser = commands.add_parser("import", help="replace all tasks with a .json or .snap file")
+    import_parser.add_argument("path")
+    query_parser = commands.add_parser("query", help="list tasks matching a search query")
+    query_parser.add_argument("text")
+    query_parser.add_argument("--explain", action="store_true", help="print the chosen plan first")
+    query_parser.add_argument("--fuzzy", action="store_true", help="rank typo-tolerant matches")
+    args = parser.parse_args()
+
+    if args.command:
+        data = open_data_manager()
+        try:
+            if args.command == "export":
+                data.export_data(args.path)
+            elif args.command == "import":
+                data.import_data(args.path)
+            else:
+                flt = TaskFilter(query=args.text, fuzzy=args.fuzzy)
+                if args.explain:
+                    print(data.explain(flt))
+                for task in data.query_tasks(flt):
+                    print(f"{task.id}\t{task.name}")
+        except (OSError, ValueError, KeyError) as exc:
+            parser.exit(1, f"{args.command} failed: {exc}\n")
+        finally:
+            data.close()
+        return
+
     root = tk.Tk()
     TaskManagerApp(root)
     root.mainloop()
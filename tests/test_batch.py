@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from task_manager import DataManager, TaskFilter, TaskLevel, TaskType
+
+
+class Boom(Exception):
+    pass
+
+
+def test_rollback_restores_task_mutated_before_update(data_file):
+    data = DataManager(data_file)
+    task = data.create_task("original", "", TaskLevel.NORMAL, TaskType.ONCE, ["a"])
+
+    with pytest.raises(Boom):
+        with data.batch():
+            t = data.get_task(task.id)
+            t.name = "renamed"
+            t.tags.append("b")
+            data.update_task(t)
+            raise Boom()
+
+    assert data.get_task(task.id).name == "original"
+    assert data.get_task(task.id).tags == ["a"]
+    assert data.query_tasks(TaskFilter(keyword="renamed")) == []
+    assert data.query_tasks(TaskFilter(tags=("b",))) == []
+    data.close()
+    assert DataManager(data_file).get_task(task.id).name == "original"
+
+
+def test_rollback_restores_tasks_mutated_through_iteration(data_file):
+    data = DataManager(data_file)
+    ids = [data.create_task(f"t{i}", "", TaskLevel.SIMPLE, TaskType.ONCE).id for i in range(3)]
+
+    with pytest.raises(Boom):
+        with data.batch():
+            for t in data.iter_tasks():
+                t.description = "changed"
+                data.update_task(t)
+            raise Boom()
+
+    assert [data.get_task(i).description for i in ids] == ["", "", ""]
+
+
+def test_rollback_undoes_create_delete_and_coins(data_file):
+    data = DataManager(data_file)
+    keep = data.create_task("keep", "", TaskLevel.HARD, TaskType.ONCE)
+    gone = data.create_task("gone", "", TaskLevel.SIMPLE, TaskType.ONCE)
+
+    with pytest.raises(Boom):
+        with data.batch():
+            data.create_task("new", "", TaskLevel.SIMPLE, TaskType.ONCE)
+            data.delete_task(gone.id)
+            data.complete_task(keep.id)
+            raise Boom()
+
+    assert [t.name for t in data.tasks] == ["keep", "gone"]
+    assert data.total_coins == 0
+    assert data.get_task(keep.id).can_complete
+
+
+def test_committed_batch_is_persisted(data_file):
+    data = DataManager(data_file)
+    with data.batch():
+        t = data.create_task("a", "", TaskLevel.SIMPLE, TaskType.ONCE)
+        t = data.get_task(t.id)
+        t.name = "b"
+        data.update_task(t)
+    data.close()
+    assert [t.name for t in DataManager(data_file).tasks] == ["b"]
+
+
+@pytest.mark.parametrize("mode", ["journal", "snapshot"])
+def test_save_inside_batch_while_compacting(data_file, monkeypatch, mode):
+    data = DataManager(data_file, storage_mode=mode)
+    data.create_task("before", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    writing = threading.Event()
+    fsync = os.fsync
+
+    def slow_fsync(fd):
+        writing.set()
+        time.sleep(0.3)
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", slow_fsync)
+    compaction = threading.Thread(target=data.save, daemon=True)
+    compaction.start()
+    assert writing.wait(5)
+
+    def edit():
+        with data.batch():
+            data.create_task("inside", "", TaskLevel.SIMPLE, TaskType.ONCE)
+            data.save()
+
+    worker = threading.Thread(target=edit, daemon=True)
+    worker.start()
+    worker.join(10)
+    compaction.join(10)
+    assert not worker.is_alive()
+    assert not compaction.is_alive()
+    data.close()
+    with open(data_file, encoding="utf-8") as f:
+        names = [t["name"] for t in json.load(f)["tasks"]]
+    assert names == ["before", "inside"]
@@ -0,0 +1,156 @@
+from task_manager import DataManager, TaskFilter, TaskLevel, TaskType
+
+
+def _ids(data, **kwargs):
+    return sorted(data.query_task_ids(TaskFilter(**kwargs)))
+
+
+def _make(data_file, count=30):
+    data = DataManager(data_file)
+    ids = [
+        data.create_task(f"task {i}", "walk the dog" if i % 2 else "buy milk", TaskLevel.SIMPLE, TaskType.ONCE).id
+        for i in range(count)
+    ]
+    return data, ids
+
+
+def test_columns_track_updates_deletes_and_completions(data_file):
+    data, ids = _make(data_file, count=6)
+    task = data.get_task(ids[0])
+    task.level = TaskLevel.EPIC
+    task.task_type = TaskType.DAILY
+    data.update_task(task)
+    data.complete_task(ids[1])
+    data.delete_task(ids[2])
+
+    assert _ids(data, level=TaskLevel.EPIC) == [ids[0]]
+    assert _ids(data, level=TaskLevel.SIMPLE) == sorted(ids[1:2] + ids[3:])
+    assert _ids(data, task_type=TaskType.DAILY) == [ids[0]]
+    assert _ids(data, status="completed") == [ids[1]]
+    assert _ids(data, status="available") == sorted([ids[0]] + ids[3:])
+    assert ids[2] not in _ids(data)
+
+
+def test_text_index_builds_in_chunks(data_file):
+    data, ids = _make(data_file)
+    assert not data.indexed
+    assert not data.index_more(10)
+    data.create_task("fresh dog", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    while not data.index_more(10):
+        pass
+    assert data.indexed
+    assert len(_ids(data, keyword="dog")) == 16
+
+
+def test_text_index_tracks_updates_and_deletes_mid_build(data_file):
+    data, ids = _make(data_file)
+    data.index_more(5)
+    task = data.get_task(ids[1])
+    task.description = "buy milk"
+    data.update_task(task)
+    data.delete_task(ids[3])
+    task = data.get_task(ids[0])
+    task.name = "dog day"
+    data.update_task(task)
+    expected = sorted(
+        t.id for t in data.tasks if "dog" in t.name.lower() or "dog" in t.description.lower()
+    )
+    assert _ids(data, keyword="dog") == expected
+    assert ids[3] not in _ids(data, keyword="task")
+
+
+def test_text_index_tracks_updates_and_deletes_after_build(data_file):
+    data, ids = _make(data_file)
+    assert len(_ids(data, keyword="milk")) == 15
+    task = data.get_task(ids[0])
+    task.description = "nothing"
+    data.update_task(task)
+    data.delete_task(ids[2])
+    assert len(_ids(data, keyword="milk")) == 13
+    assert _ids(data, keyword="nothing") == [ids[0]]
+
+
+def test_tag_index_tracks_updates_and_deletes(data_file):
+    data = DataManager(data_file)
+    a = data.create_task("a", "", TaskLevel.SIMPLE, TaskType.ONCE, ["Work", "home"])
+    b = data.create_task("b", "", TaskLevel.SIMPLE, TaskType.ONCE, ["work"])
+    assert data.tag_count("WORK") == 2
+    assert _ids(data, tags=("work",)) == sorted([a.id, b.id])
+
+    task = data.get_task(a.id)
+    task.tags = ["garden"]
+    data.update_task(task)
+    data.delete_task(b.id)
+    assert data.tag_count("work") == 0
+    assert _ids(data, tags=("work",)) == []
+    assert _ids(data, tags=("Garden",)) == [a.id]
+    assert data.suggest_tags("") == [("garden", 1)]
+
+
+def test_sort_indexes_track_updates_and_deletes(data_file):
+    data = DataManager(data_file)
+    levels = [TaskLevel.HARD, TaskLevel.SIMPLE, TaskLevel.EPIC, TaskLevel.NORMAL]
+    ids = [data.create_task(f"n{i}", "", level, TaskType.ONCE).id for i, level in enumerate(levels)]
+    by_name = data.query_task_ids(TaskFilter(sort_field="name"))
+    assert by_name == ids
+    data.query_task_ids(TaskFilter(sort_field="level"))
+
+    task = data.get_task(ids[0])
+    task.name = "z last"
+    task.level = TaskLevel.SIMPLE
+    data.update_task(task)
+    data.delete_task(ids[2])
+    data.create_task("a first", "", TaskLevel.EPIC, TaskType.ONCE)
+
+    expected_names = sorted(data.tasks, key=lambda t: t.name)
+    assert data.query_task_ids(TaskFilter(sort_field="name")) == [t.id for t in expected_names]
+    assert data.query_task_ids(TaskFilter(sort_field="name", descending=True)) == [
+        t.id for t in reversed(expected_names)
+    ]
+    by_level = data.query_task_ids(TaskFilter(sort_field="level"))
+    assert [data.get_task(i).level.order for i in by_level] == sorted(t.level.order for t in data.tasks)
+    page, total = data.query_page(TaskFilter(sort_field="name"), 0, 2)
+    assert total == 4 and page == [t.id for t in expected_names[:2]]
+
+
+def _fuzzy(data, text):
+    return data.query_task_ids(TaskFilter(query=text, fuzzy=True))
+
+
+def test_fuzzy_index_tracks_updates_and_deletes(data_file):
+    data, ids = _make(data_file)
+    data.index_more(5)
+    task = data.get_task(ids[0])
+    task.name = "dentist appointment"
+    data.update_task(task)
+    assert _fuzzy(data, "dentsit apointment") == [ids[0]]
+    task.name = "garden"
+    data.update_task(task)
+    assert _fuzzy(data, "dentsit apointment") == []
+    data.delete_task(ids[0])
+    assert _fuzzy(data, "gardn") == []
+
+
+def test_fuzzy_ranks_closest_first(data_file):
+    data = DataManager(data_file)
+    longer = data.create_task("budget report for the weekly meeting", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    data.create_task("budget", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    exact = data.create_task("budget report", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    assert _fuzzy(data, "buget reprot") == [exact.id, longer.id]
+
+
+def test_fuzzy_candidate_limit_only_caps_ranking(data_file, monkeypatch):
+    import task_manager
+
+    data = DataManager(data_file)
+    chores = [r.task_id for r in data.create_tasks([{"name": f"garden chores {i}"} for i in range(40)])]
+    data.create_tasks([{"name": f"laundry {i}"} for i in range(10)])
+    best = data.create_task("garden", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    monkeypatch.setattr(task_manager, "FUZZY_CANDIDATE_LIMIT", 5)
+    found = _fuzzy(data, "gardne")
+    assert len(found) == 41
+    assert found[0] == best.id
+    assert set(found[5:]) < set(chores)
+    ids, total = data.query_page(TaskFilter(query="gardne", fuzzy=True), 40, 50)
+    assert total == 41
+    assert ids == found[40:]
@@ -0,0 +1,67 @@
+import os
+import time
+
+from task_manager import DataManager, TaskLevel, TaskType
+
+
+def _wait(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return predicate()
+
+
+def _task(data, task_id):
+    return next(t for t in data.tasks if t.id == task_id)
+
+
+def test_mutations_are_replayed_from_the_journal(data_file):
+    data = DataManager(data_file)
+    kept = data.create_task("kept", "", TaskLevel.HARD, TaskType.DAILY, ["x"])
+    gone = data.create_task("gone", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    task = _task(data, kept.id)
+    task.description = "edited"
+    data.update_task(task)
+    data.delete_task(gone.id)
+    data.complete_task(kept.id)
+    assert os.path.getsize(data.journal_file) > 0
+
+    reloaded = DataManager(data_file)
+    assert [t.id for t in reloaded.tasks] == [kept.id]
+    assert _task(reloaded, kept.id).description == "edited"
+    assert not _task(reloaded, kept.id).can_complete
+    assert reloaded.total_coins == TaskLevel.HARD.reward
+
+
+def test_torn_journal_tail_is_ignored(data_file):
+    data = DataManager(data_file)
+    task = data.create_task("a", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    with open(data.journal_file, "ab") as f:
+        f.write(b'{"op":"put","task":{"id":')
+
+    assert [t.id for t in DataManager(data_file).tasks] == [task.id]
+
+
+def test_save_folds_the_journal_into_the_data_file(data_file):
+    data = DataManager(data_file)
+    task = data.create_task("a", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    data.save()
+    assert not os.path.exists(data.journal_file) or os.path.getsize(data.journal_file) == 0
+
+    data.create_task("b", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    reloaded = DataManager(data_file)
+    assert [t.name for t in reloaded.tasks] == ["a", "b"]
+    assert _task(reloaded, task.id).name == "a"
+
+
+def test_background_compaction_keeps_every_mutation(data_file):
+    data = DataManager(data_file, compact_threshold=2000)
+    ids = [data.create_task(f"t{i}", "", TaskLevel.SIMPLE, TaskType.ONCE).id for i in range(60)]
+    for task_id in ids[::3]:
+        data.delete_task(task_id)
+    assert _wait(lambda: not data._compacting)
+    assert os.path.exists(data_file)
+
+    expected = [task_id for i, task_id in enumerate(ids) if i % 3]
+    assert [t.id for t in DataManager(data_file).tasks] == expected
+
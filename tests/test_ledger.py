@@ -0,0 +1,76 @@
+import json
+import os
+from datetime import datetime
+
+from task_manager import DataManager, SQLiteDataManager, TaskLevel, TaskType
+
+HISTORY = [
+    {"task_id": "a", "task_name": "A", "coins": 10, "timestamp": "2024-03-02T10:00:00"},
+    {"task_id": "b", "task_name": "B", "coins": 50, "timestamp": "2024-01-05T10:00:00"},
+    {"task_id": "a", "task_name": "A", "coins": 10, "timestamp": "2024-02-01T10:00:00"},
+]
+
+
+def _legacy(data_file):
+    with open(data_file, "w", encoding="utf-8") as f:
+        json.dump({"tasks": [], "total_coins": 70, "coin_history": HISTORY}, f)
+    return DataManager(data_file)
+
+
+def test_legacy_history_migrates_sorted(data_file):
+    data = _legacy(data_file)
+    assert [e["timestamp"] for e in data.iter_coin_history()] == sorted(e["timestamp"] for e in HISTORY)
+    assert len(data.coin_ledger) == 3 and data.coin_ledger.total == 70
+    data.close()
+    with open(data_file, encoding="utf-8") as f:
+        assert "coin_history" not in json.load(f)
+    assert DataManager(data_file).coin_ledger.total == 70
+
+
+def test_range_queries_and_running_totals(data_file):
+    data = _legacy(data_file)
+    assert data.coins_between(datetime(2024, 1, 1), datetime(2024, 2, 15)) == 60
+    assert data.coins_between(datetime(2024, 2, 15)) == 10
+    assert [e["coins"] for e in data.iter_coin_history(end=datetime(2024, 2, 1))] == [50]
+
+    task = data.create_task("x", "", TaskLevel.EPIC, TaskType.ONCE)
+    data.complete_task(task.id)
+    assert data.total_coins == data.coin_ledger.total == 70 + TaskLevel.EPIC.reward
+    assert data.coins_between(datetime(2025, 1, 1)) == TaskLevel.EPIC.reward
+
+
+def test_timestamps_are_stored_verbatim(data_file):
+    data = _legacy(data_file)
+    data.coin_ledger.append([{"task_id": "c", "task_name": "C", "coins": 1, "timestamp": "2023-06-01T00:00:00"}])
+    assert list(data.iter_coin_history())[-1]["timestamp"] == "2023-06-01T00:00:00"
+
+
+def test_totals_sidecar_is_rebuilt(data_file):
+    data = _legacy(data_file)
+    data.close()
+    os.remove(data.coin_ledger.totals_path)
+    reloaded = DataManager(data_file)
+    assert reloaded.coin_ledger.total == 70
+    assert reloaded.coins_between(datetime(2024, 2, 15)) == 10
+
+
+def test_export_import_round_trip(data_file, tmp_path):
+    data = _legacy(data_file)
+    task = data.create_task("x", "", TaskLevel.EPIC, TaskType.ONCE)
+    data.complete_task(task.id)
+    total = 70 + TaskLevel.EPIC.reward
+    for ext in (".json", ".snap"):
+        exported = str(tmp_path / ("export" + ext))
+        data.export_data(exported)
+
+        target = DataManager(str(tmp_path / ext[1:] / "task_data.json"))
+        target.import_data(exported)
+        assert target.total_coins == target.coin_ledger.total == total
+        assert [e["coins"] for e in target.iter_coin_history()] == [50, 10, 10, TaskLevel.EPIC.reward]
+        target.close()
+
+        db = SQLiteDataManager(str(tmp_path / ext[1:] / "task_data.db"))
+        db.import_data(exported)
+        assert db.total_coins == total
+        assert len(list(db.iter_coin_history())) == 4
+        db.close()
@@ -0,0 +1,158 @@
+import sys
+
+import pytest
+
+from task_manager import (
+    DataManager,
+    Query,
+    QueryTerm,
+    SQLiteDataManager,
+    TaskFilter,
+    TaskLevel,
+    TaskType,
+    _US_PER_DAY,
+    _to_epoch_us,
+    main,
+    parse_query,
+)
+
+TASKS = [
+    ("Read book", TaskLevel.HARD, TaskType.DAILY, ["study", "book"], "2024-01-10T09:00:00", True),
+    ("Walk dog", TaskLevel.SIMPLE, TaskType.ONCE, ["outdoor"], "2024-02-01T09:00:00", True),
+    ("Write essay", TaskLevel.NORMAL, TaskType.WEEKLY, ["study"], "2024-03-05T09:00:00", False),
+    ("Read news", TaskLevel.EPIC, TaskType.ONCE, [], "2024-03-05T18:00:00", False),
+]
+
+
+def _fill(data):
+    for name, level, task_type, tags, created_at, done in TASKS:
+        task = data.create_task(name, "", level, task_type, tags)
+        task = data.get_task(task.id)
+        task.created_at = created_at
+        data.update_task(task)
+        if done:
+            data.complete_task(task.id)
+    return data
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def board(request, tmp_path):
+    if request.param == "json":
+        data = DataManager(str(tmp_path / "task_data.json"))
+    else:
+        data = SQLiteDataManager(str(tmp_path / "task_data.db"))
+    yield _fill(data)
+    data.close()
+
+
+def _names(data, text):
+    return [data.get_task(task_id).name for task_id in data.query_task_ids(TaskFilter(query=text))]
+
+
+def test_parse_query_fields():
+    query = parse_query(
+        'read -walk "morning run" foo:bar level:hard -lv:1 type:daily tag:A|b -tag:c'
+        " status:avail created:>=2024-01-01 sort:name order:desc"
+    )
+    assert query == Query(
+        (
+            QueryTerm("text", "read", False, "read"),
+            QueryTerm("text", "walk", True, "-walk"),
+            QueryTerm("text", "morning run", False, '"morning run"'),
+            QueryTerm("text", "foo:bar", False, "foo:bar"),
+            QueryTerm("level", TaskLevel.HARD.order, False, "level:hard"),
+            QueryTerm("level", TaskLevel.SIMPLE.order, True, "-lv:1"),
+            QueryTerm("type", 1, False, "type:daily"),
+            QueryTerm("tag", ("a", "b"), False, "tag:A|b"),
+            QueryTerm("tag", ("c",), True, "-tag:c"),
+            QueryTerm("status", "available", False, "status:avail"),
+            QueryTerm("created", (_to_epoch_us("2024-01-01"), None), False, "created:>=2024-01-01"),
+        ),
+        "name",
+        True,
+    )
+
+
+def test_parse_query_labels_prefixes_and_dates():
+    day = _to_epoch_us("2024-03-05")
+    terms = parse_query("level:困难 level:ep type:每周任务 tag: created:2024-03-05 created:<2024-03-05T10:00:00").terms
+    assert [term.value for term in terms] == [
+        TaskLevel.HARD.order,
+        TaskLevel.EPIC.order,
+        2,
+        (day, day + _US_PER_DAY),
+        (None, _to_epoch_us("2024-03-05T10:00:00")),
+    ]
+    assert parse_query("") == Query()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "level:legendary",
+        "type:monthly",
+        "status:c",
+        "status:done",
+        "tag:|",
+        "created:yesterday",
+        "created:>=",
+        "sort:size",
+        "order:up",
+    ],
+)
+def test_parse_query_rejects_invalid_values(text):
+    with pytest.raises(ValueError):
+        parse_query(text)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("read", {"Read book", "Read news"}),
+        ("-read", {"Walk dog", "Write essay"}),
+        ('"read book"', {"Read book"}),
+        ("level:hard", {"Read book"}),
+        ("-level:simple", {"Read book", "Write essay", "Read news"}),
+        ("type:once", {"Walk dog", "Read news"}),
+        ("tag:study", {"Read book", "Write essay"}),
+        ("tag:book|outdoor", {"Read book", "Walk dog"}),
+        ("-tag:study", {"Walk dog", "Read news"}),
+        ("status:available", {"Write essay", "Read news"}),
+        ("status:cooldown", {"Read book"}),
+        ("status:completed", {"Walk dog"}),
+        ("created:2024-03-05", {"Write essay", "Read news"}),
+        ("created:>2024-02-01", {"Write essay", "Read news"}),
+        ("created:>=2024-02-01", {"Walk dog", "Write essay", "Read news"}),
+        ("created:<2024-02-01", {"Read book"}),
+        ("created:<=2024-02-01", {"Read book", "Walk dog"}),
+        ("read tag:study", {"Read book"}),
+    ],
+)
+def test_query_operators(board, text, expected):
+    assert set(_names(board, text)) == expected
+
+
+def test_query_sorting(board):
+    assert _names(board, "sort:name") == ["Read book", "Read news", "Walk dog", "Write essay"]
+    assert _names(board, "sort:name order:desc") == ["Write essay", "Walk dog", "Read news", "Read book"]
+    assert _names(board, "sort:created order:desc") == ["Read news", "Write essay", "Walk dog", "Read book"]
+
+
+def test_cli_query(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    data = _fill(DataManager("task_data.json"))
+    data.close()
+    ids = {task.name: task.id for task in data.tasks}
+
+    monkeypatch.setattr(sys, "argv", ["task_manager.py", "query", "tag:study sort:name"])
+    main()
+    assert capsys.readouterr().out.splitlines() == [
+        f"{ids['Read book']}\tRead book",
+        f"{ids['Write essay']}\tWrite essay",
+    ]
+
+    monkeypatch.setattr(sys, "argv", ["task_manager.py", "query", "level:legendary"])
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == 1
+    assert "query failed: invalid level: legendary" in capsys.readouterr().err
@@ -0,0 +1,92 @@
+import json
+import os
+
+from task_manager import DataManager, TaskLevel, TaskSnapshot, TaskType
+
+
+def _store(data_file):
+    data = DataManager(data_file)
+    a = data.create_task("read", "chapter 1", TaskLevel.HARD, TaskType.DAILY, ["study", "book"])
+    data.create_task("walk", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    data.complete_task(a.id)
+    data.save()
+    data.close()
+    return data
+
+
+def _sources(monkeypatch):
+    sources = []
+    read_source = DataManager._read_source
+
+    def spy(self, path, verify=True):
+        sources.append(path)
+        return read_source(self, path, verify)
+
+    monkeypatch.setattr(DataManager, "_read_source", spy)
+    return sources
+
+
+def _summary(data):
+    return [(t.name, t.description, t.level, t.task_type, t.tags, t.can_complete) for t in data.tasks]
+
+
+def test_snapshot_round_trip(data_file, monkeypatch):
+    stored = _store(data_file)
+    with TaskSnapshot(stored.snapshot_file) as snapshot:
+        assert snapshot.verify()
+        assert snapshot.task_count == 2
+
+    sources = _sources(monkeypatch)
+    data = DataManager(data_file)
+    assert sources == [stored.snapshot_file]
+    assert _summary(data) == [
+        ("read", "chapter 1", TaskLevel.HARD, TaskType.DAILY, ["study", "book"], False),
+        ("walk", "", TaskLevel.SIMPLE, TaskType.ONCE, [], True),
+    ]
+    assert data.total_coins == TaskLevel.HARD.reward
+
+
+def test_corrupt_snapshot_falls_back_to_json(data_file, monkeypatch, capsys):
+    stored = _store(data_file)
+    expected = _summary(DataManager(data_file))
+    with open(stored.snapshot_file, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    sources = _sources(monkeypatch)
+    assert _summary(DataManager(data_file)) == expected
+    assert sources == [data_file]
+    assert "checksum mismatch" in capsys.readouterr().out
+
+
+def test_truncated_snapshot_falls_back_to_json(data_file, monkeypatch, capsys):
+    stored = _store(data_file)
+    expected = _summary(DataManager(data_file))
+    with open(stored.snapshot_file, "r+b") as f:
+        f.truncate(os.path.getsize(stored.snapshot_file) // 2)
+
+    sources = _sources(monkeypatch)
+    assert _summary(DataManager(data_file)) == expected
+    assert sources == [data_file]
+    assert "Snapshot unreadable" in capsys.readouterr().out
+
+
+def test_export_leaves_out_bookkeeping(data_file, tmp_path):
+    _store(data_file)
+    data = DataManager(data_file)
+    json_path = str(tmp_path / "export.json")
+    snap_path = str(tmp_path / "export.snap")
+    data.export_data(json_path)
+    data.export_data(snap_path)
+
+    with open(json_path, encoding="utf-8") as f:
+        exported = json.load(f)
+    with TaskSnapshot(snap_path) as snapshot:
+        snap_keys = {key for key, _value, is_item in snapshot.members() if not is_item}
+    assert "total_coins" in snap_keys
+    for keys in (set(exported), snap_keys):
+        assert not keys & {"journal_seq", "base_rev"}
+    assert exported["total_coins"] == TaskLevel.HARD.reward
+    assert len(exported["tasks"]) == 2
@@ -0,0 +1,77 @@
+import os
+import sqlite3
+
+from task_manager import DataManager, SQLiteDataManager, TaskLevel, TaskType, open_data_manager
+
+
+def _task(data, task_id):
+    return next(t for t in data.tasks if t.id == task_id)
+
+
+def _json_store(data_file):
+    data = DataManager(data_file)
+    task = data.create_task("read", "chapter 1", TaskLevel.HARD, TaskType.DAILY, ["study"])
+    data.create_task("walk", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    data.complete_task(task.id)
+    data.storage_backend = "sqlite"
+    data.save()
+    return task
+
+
+def test_migration_moves_json_data_into_sqlite(data_file):
+    task = _json_store(data_file)
+
+    db = open_data_manager(data_file)
+    assert isinstance(db, SQLiteDataManager)
+    assert [t.name for t in db.tasks] == ["read", "walk"]
+    assert _task(db, task.id).tags == ["study"]
+    assert db.total_coins == TaskLevel.HARD.reward
+    db.close()
+    assert os.path.exists(data_file + ".migrated")
+
+    db = open_data_manager(data_file)
+    assert isinstance(db, SQLiteDataManager)
+    assert [t.name for t in db.tasks] == ["read", "walk"]
+    db.close()
+
+
+def test_failed_migration_keeps_json_backend(data_file, monkeypatch):
+    task = _json_store(data_file)
+
+    def fail(self, task):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(SQLiteDataManager, "_write_task", fail)
+    data = open_data_manager(data_file)
+    assert not isinstance(data, SQLiteDataManager)
+    assert [t.name for t in data.tasks] == ["read", "walk"]
+    assert data.total_coins == TaskLevel.HARD.reward
+    assert not os.path.exists(data_file + ".migrated")
+
+    monkeypatch.undo()
+    db = open_data_manager(data_file)
+    assert isinstance(db, SQLiteDataManager)
+    assert _task(db, task.id).name == "read"
+    db.close()
+
+
+def test_crud_round_trip(tmp_path):
+    db_file = str(tmp_path / "task_data.db")
+    db = SQLiteDataManager(db_file)
+    kept = db.create_task("kept", "", TaskLevel.NORMAL, TaskType.ONCE, ["a", "b"])
+    gone = db.create_task("gone", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    task = _task(db, kept.id)
+    task.description = "edited"
+    task.tags = ["b"]
+    db.update_task(task)
+    db.delete_task(gone.id)
+    assert db.complete_task(kept.id) == TaskLevel.NORMAL.reward
+    db.close()
+
+    db = SQLiteDataManager(db_file)
+    assert [t.id for t in db.tasks] == [kept.id]
+    task = _task(db, kept.id)
+    assert (task.description, task.tags, task.can_complete) == ("edited", ["b"], False)
+    assert db.total_coins == TaskLevel.NORMAL.reward
+    assert not any(os.path.exists(str(tmp_path / name)) for name in ("task_data.journal", "task_data.json"))
+    db.close()
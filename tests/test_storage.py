@@ -0,0 +1,35 @@
+import json
+
+from task_manager import FLUSH_INTERVAL_SECONDS, DataManager, TaskLevel, TaskType
+
+
+def _stored(data_file):
+    with open(data_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_write_behind_flushes_on_close(data_file):
+    data = DataManager(data_file, storage_mode="write_behind", flush_interval=3600)
+    data.create_task("first", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    data.create_task("second", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    data.close()
+
+    assert [t["name"] for t in _stored(data_file)["tasks"]] == ["first", "second"]
+    assert [t.name for t in DataManager(data_file).tasks] == ["first", "second"]
+
+
+def test_constructor_overrides_are_not_persisted(data_file):
+    data = DataManager(data_file, storage_mode="write_behind", flush_interval=3600)
+    data.create_task("task", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    data.close()
+    stored = _stored(data_file)
+    assert (stored["storage_mode"], stored["flush_interval"]) == ("journal", FLUSH_INTERVAL_SECONDS)
+
+    data = DataManager(data_file)
+    assert data.storage_mode == "journal"
+    data.storage_mode = "snapshot"
+    data.save()
+    data.close()
+    assert DataManager(data_file).storage_mode == "snapshot"
+    assert DataManager(data_file, storage_mode="journal").storage_mode == "journal"
+    assert _stored(data_file)["storage_mode"] == "snapshot"
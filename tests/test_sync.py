@@ -0,0 +1,107 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+from task_manager import DataManager, TaskLevel, TaskType
+
+
+def test_journal_changes_reach_the_other_instance(data_file):
+    a = DataManager(data_file)
+    b = DataManager(data_file)
+    task = a.create_task("x", "", TaskLevel.EPIC, TaskType.DAILY)
+    assert b.poll_external_changes() == {task.id}
+    assert b.poll_external_changes() == set()
+
+    mine = b.get_task(task.id)
+    mine.name = "x2"
+    b.update_task(mine)
+    assert a.poll_external_changes() == {task.id}
+    assert a.get_task(task.id).name == "x2"
+
+    a.complete_task(task.id)
+    assert b.poll_external_changes() == {task.id}
+    assert b.total_coins == TaskLevel.EPIC.reward
+    assert not b.get_task(task.id).can_complete
+
+
+def test_compacted_changes_are_merged(data_file):
+    a = DataManager(data_file)
+    b = DataManager(data_file)
+    keep = a.create_task("keep", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    gone = a.create_task("gone", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    b.poll_external_changes()
+    a.delete_task(gone.id)
+    a.save()
+    assert not os.path.exists(a.journal_file) or os.path.getsize(a.journal_file) == 0
+
+    assert b.poll_external_changes() == {gone.id}
+    assert [t.id for t in b.tasks] == [keep.id]
+    os.utime(data_file, None)
+    assert b.poll_external_changes() == set()
+
+
+def test_coins_from_both_instances_add_up(data_file):
+    a = DataManager(data_file)
+    b = DataManager(data_file)
+    x = a.create_task("x", "", TaskLevel.EPIC, TaskType.ONCE)
+    y = a.create_task("y", "", TaskLevel.HARD, TaskType.ONCE)
+    b.poll_external_changes()
+    a.complete_task(x.id)
+    b.complete_task(y.id)
+    a.poll_external_changes()
+    b.poll_external_changes()
+    total = TaskLevel.EPIC.reward + TaskLevel.HARD.reward
+    fresh = DataManager(data_file)
+    assert a.total_coins == b.total_coins == fresh.total_coins == fresh.coin_ledger.total == total
+
+
+def test_unflushed_local_edit_wins_over_external_save(data_file):
+    a = DataManager(data_file)
+    task = a.create_task("z", "", TaskLevel.SIMPLE, TaskType.ONCE)
+    w = DataManager(data_file, storage_mode="write_behind", flush_interval=60)
+    mine = w.get_task(task.id)
+    mine.name = "first"
+    w.update_task(mine)
+    deadline = time.monotonic() + 5
+    while w._dirty and time.monotonic() < deadline:
+        time.sleep(0.02)
+    a.poll_external_changes()
+    mine.name = "mine"
+    w.update_task(mine)
+
+    theirs = a.get_task(task.id)
+    theirs.name = "theirs"
+    a.update_task(theirs)
+    a.save()
+    w.poll_external_changes()
+    assert w.get_task(task.id).name == "mine"
+    w.close()
+    assert DataManager(data_file).get_task(task.id).name == "mine"
+
+
+def test_concurrent_processes_lose_nothing(data_file):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = textwrap.dedent(
+        """
+        import sys
+        sys.path.insert(0, %r)
+        import task_manager as tm
+        data = tm.DataManager(%r, compact_threshold=8000)
+        for i in range(60):
+            task = data.create_task(sys.argv[1] + str(i), "", tm.TaskLevel.SIMPLE, tm.TaskType.ONCE)
+            if i %% 3 == 0:
+                data.complete_task(task.id)
+        data.close()
+        """
+    ) % (root, data_file)
+    procs = [subprocess.Popen([sys.executable, "-c", script, prefix]) for prefix in "PQR"]
+    for proc in procs:
+        assert proc.wait(timeout=120) == 0
+    time.sleep(0.1)
+
+    data = DataManager(data_file)
+    names = {t.name for t in data.tasks}
+    assert names == {prefix + str(i) for prefix in "PQR" for i in range(60)}
+    assert data.total_coins == data.coin_ledger.total == 3 * 20 * TaskLevel.SIMPLE.reward